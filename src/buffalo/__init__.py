@@ -1,8 +1,18 @@
 """Buffalo board game package."""
 
-from .dqn import QNetwork, ReplayBuffer, ReplayBufferDataset, compute_reward, DQNAgent
-from .encoders import BoardStateEncoder
-from .models import BuffaloQNetwork
+from importlib import import_module
+
+# Everything exported here depends on torch, so resolve it on first access (PEP 562)
+# instead of paying the torch import for users that only need ``buffalo.board``.
+_LAZY_EXPORTS = {
+    "BoardStateEncoder": ".encoders",
+    "BuffaloQNetwork": ".models",
+    "QNetwork": ".dqn",
+    "ReplayBuffer": ".dqn",
+    "ReplayBufferDataset": ".dqn",
+    "compute_reward": ".dqn",
+    "DQNAgent": ".dqn",
+}
 
 __all__ = [
     "BoardStateEncoder",
@@ -13,3 +23,16 @@ __all__ = [
     "compute_reward",
     "DQNAgent",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
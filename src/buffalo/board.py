@@ -1,36 +1,52 @@
 from __future__ import annotations
 
+import json
+import random
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 from dataclasses_json import config, dataclass_json
 
+try:  # optional, faster JSON decoder for reading game logs
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 
 class Player(Enum):
     BUFFALO = 0
     HUNTERS = 1
 
+    # members are singletons compared by identity, so hash by identity too; Enum's
+    # default hashes the member name in Python code on every dict lookup
+    __hash__ = object.__hash__
+
 
 class PieceType(Enum):
     BUFFALO = "B"
     DOG = "D"
     CHIEF = "C"
 
+    __hash__ = object.__hash__
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Position:
     x: int
     y: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Piece:
     type: PieceType
     player: Player
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Move:
     player: Player
     piece: Piece
@@ -45,152 +61,305 @@ class GameOverReason(Enum):
     BUFFALO_EXTINCT = "buffalo_extinct"
 
 
+# Each square of the board grid holds one byte: 0 for empty, otherwise the piece code.
+# The owning player is derivable from the piece type (only buffalo belong to BUFFALO).
+# Pieces are immutable, so the grid hands out these shared instances.
+_EMPTY = 0
+_BUFFALO_CODE = 1
+_DOG_CODE = 2
+_CHIEF_CODE = 3
+_PIECE_CODES = {PieceType.BUFFALO: _BUFFALO_CODE, PieceType.DOG: _DOG_CODE, PieceType.CHIEF: _CHIEF_CODE}
+_PIECES_BY_CODE: Tuple[Optional[Piece], ...] = (
+    None,
+    Piece(PieceType.BUFFALO, Player.BUFFALO),
+    Piece(PieceType.DOG, Player.HUNTERS),
+    Piece(PieceType.CHIEF, Player.HUNTERS),
+)
+_PLAYER_BY_CODE: Tuple[Optional[Player], ...] = (None, Player.BUFFALO, Player.HUNTERS, Player.HUNTERS)
+# owning Player.value per piece code (the empty entry is never used)
+_OWNER_BY_CODE: Tuple[int, ...] = (0, Player.BUFFALO.value, Player.HUNTERS.value, Player.HUNTERS.value)
+# serialize() token per piece code
+_SERIAL_TOKENS = b".BDC"
+# row i is the one-hot (buffalo, dog, chief) encoding of piece code i
+_ONEHOT_LUT = np.eye(4, dtype=np.int8)[:, 1:]
+
+
+def _iter_squares(bitboard: int) -> Iterator[int]:
+    """Yield the set squares of a bitboard in increasing order."""
+
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
+
+
+class _PieceMap(MutableMapping):
+    """Dict-like ``(x, y) -> Piece`` view over a board's grid.
+
+    Reads and writes go straight through to the grid, so code that treats
+    ``board.pieces`` as a plain dict keeps working.
+    """
+
+    def __init__(self, board: "Board") -> None:
+        self._board = board
+
+    def _square(self, key: Tuple[int, int]) -> int:
+        x, y = key
+        if not (0 <= x < self._board.width and 0 <= y < self._board.height):
+            raise KeyError(key)
+        return y * self._board.width + x
+
+    def __getitem__(self, key: Tuple[int, int]) -> Piece:
+        piece = _PIECES_BY_CODE[self._board._grid[self._square(key)]]
+        if piece is None:
+            raise KeyError(key)
+        return piece
+
+    def __setitem__(self, key: Tuple[int, int], piece: Piece) -> None:
+        square = self._square(key)
+        self._board._remove(square)
+        self._board._put(square, _PIECE_CODES[piece.type])
+
+    def __delitem__(self, key: Tuple[int, int]) -> None:
+        square = self._square(key)
+        if not self._board._grid[square]:
+            raise KeyError(key)
+        self._board._remove(square)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for square in _iter_squares(self._board._occupied):
+            yield _COORDS[square]
+
+    def __len__(self) -> int:
+        return self._board._occupied.bit_count()
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
 class Board:
     width: int = 11
     height: int = 7
 
     _INITIAL_DOG_FILES = [3, 4, 6, 7]
     _INITIAL_KING_FILE = 5
+    _BOTTOM_ROW_START = (height - 1) * width
+    # bit i is square i; bitboards are plain Python ints since 77 squares overflow 64 bits
+    _BOTTOM_ROW_MASK = ((1 << width) - 1) << _BOTTOM_ROW_START
+    _EMPTY_SERIALIZED = b"/".join([b"." * width] * height)
 
     def __init__(self):
-        self.pieces: Dict[Tuple[int, int], Piece] = {}
-        self.current_player = Player.BUFFALO
+        self._grid = bytearray(self.width * self.height)
+        # zero-copy numpy view of the grid
+        self._grid_array = np.frombuffer(self._grid, dtype=np.uint8)
+        # serialize() output, kept up to date square by square
+        self._serialized = bytearray(self._EMPTY_SERIALIZED)
+        # (move_number, current_player, moves) of the last legal_moves() call
+        self._legal_cache: Optional[Tuple[int, Player, List[Move]]] = None
+        # (zobrist, pieces_after) of the last recorded move; the next record's pieces_before
+        self._recorded_pieces: Optional[Tuple[int, Dict[Tuple[int, int], Piece]]] = None
+        # one bitboard per piece code (index 0 unused), per player (by Player.value), and their union
+        self._bitboards = [0, 0, 0, 0]
+        self._own = [0, 0]
+        self._occupied = 0
+        # Zobrist hash of the position, updated incrementally on every placement and turn change
+        self.zobrist = 0
+        self._current_player = Player.BUFFALO
+        self.initialize_board()
+        self.move_number = 0
+
+    def reset(self) -> None:
+        """Restore the starting position in place, reusing this board's buffers."""
+
+        self._current_player = Player.BUFFALO
+        self._recorded_pieces = None
         self.initialize_board()
         self.move_number = 0
 
+    @property
+    def pieces(self) -> _PieceMap:
+        return _PieceMap(self)
+
+    @pieces.setter
+    def pieces(self, pieces: Dict[Tuple[int, int], Piece]) -> None:
+        self._clear()
+        piece_map = _PieceMap(self)
+        for (x, y), piece in pieces.items():
+            piece_map[(x, y)] = piece
+
+    def _put(self, square: int, code: int) -> None:
+        self._legal_cache = None
+        self._grid[square] = code
+        self._serialized[_SERIAL_INDEX[square]] = _SERIAL_TOKENS[code]
+        self.zobrist ^= _ZOBRIST_KEYS[code][square]
+        bit = 1 << square
+        self._bitboards[code] |= bit
+        self._own[_OWNER_BY_CODE[code]] |= bit
+        self._occupied |= bit
+
+    def _remove(self, square: int) -> None:
+        code = self._grid[square]
+        if code:
+            self._legal_cache = None
+            self._grid[square] = _EMPTY
+            self._serialized[_SERIAL_INDEX[square]] = _SERIAL_TOKENS[_EMPTY]
+            self.zobrist ^= _ZOBRIST_KEYS[code][square]
+            bit = 1 << square
+            self._bitboards[code] ^= bit
+            self._own[_OWNER_BY_CODE[code]] ^= bit
+            self._occupied ^= bit
+
+    def _clear(self) -> None:
+        self._legal_cache = None
+        self._bitboards = [0, 0, 0, 0]
+        self._own = [0, 0]
+        self._occupied = 0
+        self.zobrist = _ZOBRIST_SIDE if self._current_player is Player.HUNTERS else 0
+        self._grid[:] = bytes(len(self._grid))
+        self._serialized[:] = self._EMPTY_SERIALIZED
+
     def initialize_board(self) -> None:
+        self._clear()
+
         # Place buffalo pieces on top rank
         for x in range(self.width):
-            self.pieces[(x, 0)] = Piece(PieceType.BUFFALO, Player.BUFFALO)
+            self._put(x, _PIECE_CODES[PieceType.BUFFALO])
 
         # Place dogs on 2nd bottom rank
         for x in self._INITIAL_DOG_FILES:
-            self.pieces[(x, self.height - 2)] = Piece(PieceType.DOG, Player.HUNTERS)
+            self._put((self.height - 2) * self.width + x, _PIECE_CODES[PieceType.DOG])
 
         # Place chief at center bottom
-        self.pieces[(self._INITIAL_KING_FILE, self.height - 2)] = Piece(PieceType.CHIEF, Player.HUNTERS)
+        self._put((self.height - 2) * self.width + self._INITIAL_KING_FILE, _PIECE_CODES[PieceType.CHIEF])
 
-    @staticmethod
-    def _copy_pieces(pieces: Dict[Tuple[int, int], Piece]) -> Dict[Tuple[int, int], Piece]:
-        return {
-            (x, y): Piece(piece.type, piece.player)
-            for (x, y), piece in pieces.items()
-        }
+    @property
+    def bb_buf(self) -> int:
+        """Bitboard of buffalo squares; bit ``y * width + x`` is set when occupied."""
 
-    @classmethod
-    def from_pieces(cls, pieces: Dict[Tuple[int, int], Piece], current_player: Player) -> "Board":
-        board = cls()
-        board.pieces = cls._copy_pieces(pieces)
-        board.current_player = current_player
-        return board
+        return self._bitboards[_BUFFALO_CODE]
 
-    def get_piece_at(self, x: int, y: int) -> Optional[Piece]:
-        return self.pieces.get((x, y))
+    @property
+    def bb_dog(self) -> int:
+        """Bitboard of dog squares."""
 
-    def switch_player(self):
-        self.current_player = Player.HUNTERS if self.current_player == Player.BUFFALO else Player.BUFFALO
+        return self._bitboards[_DOG_CODE]
 
-    def _is_destination_inside_board(self, x: int, y: int) -> bool:
-        return 0 <= x < self.width and 0 <= y < self.height
+    @property
+    def bb_chief(self) -> int:
+        """Bitboard of chief squares."""
 
-    def _is_valid_move(self, piece: Piece, from_x: int, from_y: int, to_x: int, to_y: int) -> bool:
-        assert piece.player == self.current_player, "Piece does not belong to the current player"
+        return self._bitboards[_CHIEF_CODE]
 
-        if not self._is_destination_inside_board(to_x, to_y):
-            return False
+    @property
+    def occ(self) -> int:
+        """Bitboard of all occupied squares."""
 
-        # a move is not considered valid if it doesn't change position
-        if from_x == to_x and from_y == to_y:
-            return False
+        return self._occupied
 
-        piece_at_destination = self.get_piece_at(to_x, to_y)
-        is_destination_empty = piece_at_destination is None
-        destination_not_on_bottom_row = to_y != self.height - 1
-        destination_not_on_top_row = to_y != 0
+    def occupied_by(self, player: Player) -> int:
+        """Bitboard of the squares holding ``player``'s pieces."""
 
-        if piece.type == PieceType.BUFFALO:
-            is_one_move_down = (to_y == from_y + 1) and (from_x == to_x)
+        return self._own[player.value]
 
-            return is_one_move_down and is_destination_empty
+    def movable_buffalo(self) -> int:
+        """Bitboard of buffalo whose square one row down is empty, the bottom row included."""
 
-        if piece.type == PieceType.CHIEF:
-            delta_x, delta_y = abs(to_x - from_x), abs(to_y - from_y)
-            is_kinglike_move = delta_x <= 1 and delta_y <= 1
+        return self._bitboards[_BUFFALO_CODE] & ~(self._occupied >> self.width) & (_BOARD_MASK >> self.width)
 
-            # must be king-like
-            if not is_kinglike_move:
-                return False
+    def _snapshot_pieces(self) -> Dict[Tuple[int, int], Piece]:
+        """Return a plain dict copy of the pieces, built from the occupied squares only."""
 
-            # King can move to the bottom row
-            if not destination_not_on_bottom_row:
-                return False
+        grid = self._grid
+        return {_COORDS[square]: _PIECES_BY_CODE[grid[square]] for square in _iter_squares(self._occupied)}
 
-            # king cannot be on top row
-            if not destination_not_on_top_row:
-                return False
+    @classmethod
+    def from_pieces(cls, pieces: Dict[Tuple[int, int], Piece], current_player: Player) -> "Board":
+        board = cls()
+        board.pieces = pieces
+        board.current_player = current_player
+        return board
 
-            # King can move to empty square
-            if is_destination_empty:
-                return True
+    def get_piece_at(self, x: int, y: int) -> Optional[Piece]:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        return _PIECES_BY_CODE[self._grid[y * self.width + x]]
 
-            if piece_at_destination.player != piece.player:
-                return True
+    @property
+    def current_player(self) -> Player:
+        return self._current_player
 
-            return False
+    @current_player.setter
+    def current_player(self, player: Player) -> None:
+        if player is not self._current_player:
+            self.zobrist ^= _ZOBRIST_SIDE
+            self._current_player = player
 
-        if piece.type == PieceType.DOG:
+    @property
+    def zobrist_key(self) -> int:
+        """64-bit Zobrist hash of the position, including the side to move.
 
-            # dogs cannot capture, only block
-            if not is_destination_empty:
-                return False
+        Equal positions reached through different move orders share a key, so it can
+        index caches of legal moves, evaluations or encodings.
+        """
 
-            if not destination_not_on_top_row:
-                return False
+        return self.zobrist
+
+    def switch_player(self):
+        self.zobrist ^= _ZOBRIST_SIDE
+        self._current_player = Player.HUNTERS if self._current_player is Player.BUFFALO else Player.BUFFALO
 
-            if not destination_not_on_bottom_row:
-                return False
+    def _is_destination_inside_board(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
 
-            delta_x, delta_y = abs(to_x - from_x), abs(to_y - from_y)
-            is_queen_like_move = (delta_x == delta_y) or (to_x == from_x) or (to_y == from_y)
+    def _is_valid_move(self, piece: Piece, from_x: int, from_y: int, to_x: int, to_y: int) -> bool:
+        assert piece.player is self.current_player, "Piece does not belong to the current player"
 
-            if not is_queen_like_move:
-                return False
+        if not self._is_destination_inside_board(to_x, to_y):
+            return False
 
-            no_pieces_between = True
+        return self._is_valid_move_unchecked(piece, from_x, from_y, to_x, to_y)
 
-            step_x = 1 if to_x > from_x else -1 if to_x < from_x else 0
-            step_y = 1 if to_y > from_y else -1 if to_y < from_y else 0
-            curr_x, curr_y = from_x + step_x, from_y + step_y
-            while (curr_x, curr_y) != (to_x, to_y):
-                if self.get_piece_at(curr_x, curr_y) is not None:
-                    no_pieces_between = False
-                    break
-                curr_x += step_x
-                curr_y += step_y
+    def _is_valid_move_unchecked(self, piece: Piece, from_x: int, from_y: int, to_x: int, to_y: int) -> bool:
+        """Validate a move whose destination is already known to be on the board."""
 
-            return no_pieces_between
+        # a move is not considered valid if it doesn't change position
+        if from_x == to_x and from_y == to_y:
+            return False
 
-        return False
+        return _VALIDATORS[piece.type](self, piece, from_x, from_y, to_x, to_y)
 
     def check_for_winner(self) -> Tuple[Optional[Player], GameOverReason]:
         # any buffalo on bottom row
-        for x in range(self.width):
-            piece = self.get_piece_at(x, self.height - 1)
-            if piece is not None:
-                if piece.type == PieceType.BUFFALO:
-                    return Player.BUFFALO, GameOverReason.BUFFALO_CROSSED
+        if self._bitboards[_BUFFALO_CODE] & self._BOTTOM_ROW_MASK:
+            return Player.BUFFALO, GameOverReason.BUFFALO_CROSSED
 
         # if buffalo's turn and no legal moves, hunters win. This includes the case where no more buffalo left to move
-        if self.current_player == Player.BUFFALO and not self.legal_moves():
+        if self.current_player is Player.BUFFALO and not self.has_any_legal_move():
             return Player.HUNTERS, GameOverReason.BUFFALO_STUCK
 
         # if all buffalo are extinct, chief wins
-        any_buffalo_remaining = any(piece.type == PieceType.BUFFALO for piece in self.pieces.values())
-        if not any_buffalo_remaining:
+        if not self._bitboards[_BUFFALO_CODE]:
             return Player.HUNTERS, GameOverReason.BUFFALO_EXTINCT
 
         return None, None
 
+    def check_for_winner_cheap(self) -> Tuple[Optional[Player], Optional[GameOverReason]]:
+        """Check the win conditions that need no move generation: crossing and extinction."""
+
+        buffalo = self._bitboards[_BUFFALO_CODE]
+        if buffalo & self._BOTTOM_ROW_MASK:
+            return Player.BUFFALO, GameOverReason.BUFFALO_CROSSED
+        if not buffalo:
+            return Player.HUNTERS, GameOverReason.BUFFALO_EXTINCT
+        return None, None
+
+    def check_for_stalemate(self, legal_moves: List[Move]) -> Tuple[Optional[Player], Optional[GameOverReason]]:
+        """Detect stuck buffalo from a legal move list the caller already generated."""
+
+        if self.current_player is Player.BUFFALO and not legal_moves:
+            return Player.HUNTERS, GameOverReason.BUFFALO_STUCK
+        return None, None
+
     def move_piece(
         self,
         from_x: int,
@@ -198,12 +367,19 @@ class Board:
         to_x: int,
         to_y: int,
         with_record: bool = True,
+        skip_stalemate_check: bool = False,
     ) -> Tuple[Optional[PieceType], Optional[Player], Optional[GameOverReason], Optional["MoveRecord"]]:
+        """Apply a move for the current player and report the outcome.
+
+        Pass ``skip_stalemate_check=True`` when the caller will generate legal moves for
+        the next position anyway; only crossing and extinction are checked then, and the
+        caller detects stuck buffalo with :meth:`check_for_stalemate`.
+        """
         piece = self.get_piece_at(from_x, from_y)
         if not piece:
             raise ValueError("No piece at the starting position")
 
-        if piece.player != self.current_player:
+        if piece.player is not self.current_player:
             raise ValueError("Piece does not belong to current player")
 
         if not self._is_valid_move(piece, from_x, from_y, to_x, to_y):
@@ -212,13 +388,25 @@ class Board:
         captured_piece = self.get_piece_at(to_x, to_y)
 
         if with_record:
-            pieces_before = self._copy_pieces(self.pieces)
-
-        self.pieces[(to_x, to_y)] = piece
-        del self.pieces[(from_x, from_y)]
+            recorded = self._recorded_pieces
+            if recorded is not None and recorded[0] == self.zobrist:
+                # unchanged since the last recorded move, so copy its after-state instead of walking the board
+                pieces_before = dict(recorded[1])
+            else:
+                pieces_before = self._snapshot_pieces()
+
+        from_square = from_y * self.width + from_x
+        to_square = to_y * self.width + to_x
+        code = self._grid[from_square]
+        self._remove(to_square)
+        self._remove(from_square)
+        self._put(to_square, code)
 
         if with_record:
-            pieces_after = self._copy_pieces(self.pieces)
+            # the move only touches two squares, so derive the after-state from the before-state
+            pieces_after = dict(pieces_before)
+            del pieces_after[(from_x, from_y)]
+            pieces_after[(to_x, to_y)] = piece
 
         # increment move number
         self.move_number += 1
@@ -226,16 +414,22 @@ class Board:
         # Switch current player
         self.switch_player()
 
+        if with_record:
+            self._recorded_pieces = (self.zobrist, pieces_after)
+
         # check for winner
-        winning_player, reason = self.check_for_winner()
+        if skip_stalemate_check:
+            winning_player, reason = self.check_for_winner_cheap()
+        else:
+            winning_player, reason = self.check_for_winner()
 
         if with_record:
             move_record = MoveRecord(
                 move_number=self.move_number,
                 player=piece.player,
                 piece_type=piece.type,
-                from_pos=Position(from_x, from_y),
-                to_pos=Position(to_x, to_y),
+                from_pos=_POSITIONS[from_square],
+                to_pos=_POSITIONS[to_square],
                 pieces_before=pieces_before,
                 pieces_after=pieces_after,
                 captured_piece=captured_piece.type if captured_piece else None,
@@ -255,132 +449,504 @@ class Board:
             None,
         )
 
+    def _iter_legal_squares(self) -> Iterator[Tuple[int, int]]:
+        """Yield ``(from_square, to_square)`` for each legal move of the current player."""
+
+        bitboards = self._bitboards
+        occupied = self._occupied
+        if self.current_player is Player.BUFFALO:
+            width = self.width
+            movable = self.movable_buffalo()
+            while movable:
+                low = movable & -movable
+                from_square = low.bit_length() - 1
+                yield from_square, from_square + width
+                movable ^= low
+            return
+
+        hunters = self._own[Player.HUNTERS.value]
+        chiefs = bitboards[_CHIEF_CODE]
+        while chiefs:
+            low = chiefs & -chiefs
+            from_square = low.bit_length() - 1
+            # the chief may capture buffalo
+            targets = _CHIEF_ATTACKS[from_square] & ~hunters
+            while targets:
+                to_low = targets & -targets
+                yield from_square, to_low.bit_length() - 1
+                targets ^= to_low
+            chiefs ^= low
+
+        grid = self._grid
+        dogs = bitboards[_DOG_CODE]
+        while dogs:
+            low = dogs & -dogs
+            from_square = low.bit_length() - 1
+            # slide along each ray until blocked; dogs never capture
+            for ray in _DOG_RAYS[from_square]:
+                for to_square in ray:
+                    if grid[to_square]:
+                        break
+                    yield from_square, to_square
+            dogs ^= low
+
+    def _legal_cache_hit(self) -> Optional[List[Move]]:
+        cache = self._legal_cache
+        if cache is not None and cache[0] == self.move_number and cache[1] is self.current_player:
+            return cache[2]
+        return None
+
     def legal_moves(self) -> List[Move]:
-        """Return legal moves for the current player without mutating the board."""
+        """Return legal moves for the current player without mutating the board.
+
+        The list is cached until the board changes, so callers must not mutate it.
+        """
 
+        cached = self._legal_cache_hit()
+        if cached is not None:
+            return cached
+
+        grid = self._grid
+        move_table = _MOVE_TABLE
         legal_moves = []
-        for (from_x, from_y), piece in self.pieces.items():
-            if piece.player != self.current_player:
-                continue
-            for to_x in range(self.width):
-                for to_y in range(self.height):
-                    if self._is_valid_move(piece, from_x, from_y, to_x, to_y):
-                        move = Move(
-                            player=self.current_player,
-                            piece=piece,
-                            start=Position(from_x, from_y),
-                            end=Position(to_x, to_y),
-                        )
-                        legal_moves.append(move)
+        for from_square, to_square in self._iter_legal_squares():
+            # Move is frozen, so each (piece, from, to) is built once and shared
+            key = (grid[from_square] << 14) | (from_square << 7) | to_square
+            move = move_table.get(key)
+            if move is None:
+                piece = _PIECES_BY_CODE[grid[from_square]]
+                move = move_table[key] = Move(piece.player, piece, _POSITIONS[from_square], _POSITIONS[to_square])
+            legal_moves.append(move)
+        self._legal_cache = (self.move_number, self.current_player, legal_moves)
         return legal_moves
 
+    def legal_move_codes(self) -> List[int]:
+        """Return legal moves for the current player packed as ``(from_square << 7) | to_square``.
+
+        Squares are ``y * width + x``. Use :meth:`unpack_move` to get a :class:`Move` back.
+        """
+
+        return [(from_square << 7) | to_square for from_square, to_square in self._iter_legal_squares()]
+
+    def unpack_move(self, code: int) -> Move:
+        """Return the :class:`Move` for a packed move code on the current board."""
+
+        from_square = code >> 7
+        to_square = code & 0x7F
+        piece_code = self._grid[from_square]
+        if not piece_code:
+            raise ValueError("No piece at the starting position")
+        key = (piece_code << 14) | code
+        move = _MOVE_TABLE.get(key)
+        if move is None:
+            piece = _PIECES_BY_CODE[piece_code]
+            move = _MOVE_TABLE[key] = Move(piece.player, piece, _POSITIONS[from_square], _POSITIONS[to_square])
+        return move
+
+    def has_any_legal_move(self) -> bool:
+        """Return whether the current player can move, stopping at the first legal move."""
+
+        cached = self._legal_cache_hit()
+        if cached is not None:
+            return bool(cached)
+        return next(self._iter_legal_squares(), None) is not None
+
+    def to_numpy(self) -> np.ndarray:
+        """Return a ``(3, height, width)`` int8 one-hot of buffalo, dog and chief planes."""
+
+        return _ONEHOT_LUT[self._grid_array].reshape(self.height, self.width, 3).transpose(2, 0, 1)
+
     def serialize(self) -> str:
         """Serialize the board from top row (y=0) to bottom (y=height-1)."""
 
-        rows: List[str] = []
-        for y in range(self.height):
-            row: List[str] = []
-            for x in range(self.width):
-                piece = self.get_piece_at(x, y)
-                row.append(piece.type.value if piece else ".")
-            rows.append("".join(row))
-        return "/".join(rows)
+        return self._serialized.decode("ascii")
 
     @classmethod
     def deserialize(cls, data: str) -> "Board":
         """Create a board from serialized rows produced by serialize()."""
 
         board = cls()
-        board.pieces = {}
+        board._clear()
         board.current_player = Player.BUFFALO
 
-        rows = data.split("/")
-        if len(rows) != board.height:
-            raise ValueError("Serialized board has an unexpected number of rows.")
-
-        for y, row in enumerate(rows):
-            if len(row) != board.width:
-                raise ValueError("Serialized board has an unexpected row width.")
-            for x, char in enumerate(row):
-                if char == ".":
-                    continue
-                try:
-                    piece_type = PieceType(char)
-                except ValueError as exc:
-                    raise ValueError(f"Unknown piece token: {char}") from exc
-                player = Player.BUFFALO if piece_type == PieceType.BUFFALO else Player.HUNTERS
-                board.pieces[(x, y)] = Piece(piece_type, player)
+        for (x, y), piece in _decode_serialized_pieces(data).items():
+            board._put(y * board.width + x, _PIECE_CODES[piece.type])
         return board
 
 
+def _validate_buffalo(board: Board, piece: Piece, from_x: int, from_y: int, to_x: int, to_y: int) -> bool:
+    is_one_move_down = (to_y == from_y + 1) and (from_x == to_x)
+
+    return is_one_move_down and not board._grid[to_y * board.width + to_x]
+
+
+def _validate_chief(board: Board, piece: Piece, from_x: int, from_y: int, to_x: int, to_y: int) -> bool:
+    width = board.width
+    to_square = to_y * width + to_x
+
+    # king-like step that stays off the top and bottom rows
+    if not (_CHIEF_ATTACKS[from_y * width + from_x] >> to_square) & 1:
+        return False
+
+    # King can move to an empty square or capture an opposing piece
+    code_at_destination = board._grid[to_square]
+    return not code_at_destination or _PLAYER_BY_CODE[code_at_destination] is not piece.player
+
+
+def _validate_dog(board: Board, piece: Piece, from_x: int, from_y: int, to_x: int, to_y: int) -> bool:
+    width = board.width
+    from_square = from_y * width + from_x
+    to_square = to_y * width + to_x
+
+    # dogs cannot capture, only block
+    if board._grid[to_square]:
+        return False
+
+    # queen-like destinations off the top and bottom rows
+    if not (_DOG_ATTACKS[from_square] >> to_square) & 1:
+        return False
+
+    # no pieces in between
+    return not board._occupied & _BETWEEN[from_square][to_square]
+
+
+# one hash lookup picks the rule set instead of a chain of piece type comparisons
+_VALIDATORS = {
+    PieceType.BUFFALO: _validate_buffalo,
+    PieceType.DOG: _validate_dog,
+    PieceType.CHIEF: _validate_chief,
+}
+
+
+_DIRECTIONS = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dx, dy) != (0, 0)]
+
+
+def _build_move_tables(width: int, height: int) -> Tuple[List[int], List[int], List[List[int]], List[List[List[int]]]]:
+    """Precompute per-square move tables, indexed by ``y * width + x``.
+
+    Returns the chief's king-like attacks and the dog's queen-like attacks as
+    bitboards (both excluding the top and bottom rows), the ``between[from][to]``
+    mask of squares strictly between two squares on a shared line (0 otherwise),
+    and the dog's rays as square lists, nearest square first, stopping at the top
+    and bottom rows.
+    """
+
+    size = width * height
+    chief_attacks = [0] * size
+    dog_attacks = [0] * size
+    between = [[0] * size for _ in range(size)]
+    dog_rays: List[List[List[int]]] = [[] for _ in range(size)]
+    for square in range(size):
+        x, y = square % width, square // width
+        for dx, dy in _DIRECTIONS:
+            passed = 0
+            ray: List[int] = []
+            ray_x, ray_y = x + dx, y + dy
+            while 0 <= ray_x < width and 0 <= ray_y < height:
+                target = ray_y * width + ray_x
+                between[square][target] = passed
+                if 0 < ray_y < height - 1:
+                    dog_attacks[square] |= 1 << target
+                    if not passed:
+                        chief_attacks[square] |= 1 << target
+                    ray.append(target)
+                passed |= 1 << target
+                ray_x += dx
+                ray_y += dy
+            if ray:
+                dog_rays[square].append(ray)
+    return chief_attacks, dog_attacks, between, dog_rays
+
+
+_CHIEF_ATTACKS, _DOG_ATTACKS, _BETWEEN, _DOG_RAYS = _build_move_tables(Board.width, Board.height)
+_BOARD_MASK = (1 << (Board.width * Board.height)) - 1
+# Zobrist keys indexed by [piece code][square]; empty squares hash to 0. Seeded so
+# keys are stable across processes.
+_zobrist_rng = random.Random(0)
+_ZOBRIST_KEYS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(_zobrist_rng.getrandbits(64) if code != _EMPTY else 0 for _ in range(Board.width * Board.height))
+    for code in range(len(_PIECES_BY_CODE))
+)
+_ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+del _zobrist_rng
+
+# position of each square within serialize() output, skipping the "/" row separators
+_SERIAL_INDEX: Tuple[int, ...] = tuple(
+    (square // Board.width) * (Board.width + 1) + square % Board.width for square in range(Board.width * Board.height)
+)
+# (x, y) coordinates, indexed by square
+_COORDS: Tuple[Tuple[int, int], ...] = tuple(
+    (square % Board.width, square // Board.width) for square in range(Board.width * Board.height)
+)
+# interned positions, indexed by square
+_POSITIONS: Tuple[Position, ...] = tuple(
+    Position(square % Board.width, square // Board.width) for square in range(Board.width * Board.height)
+)
+# interned moves keyed by (piece code << 14) | (from_square << 7) | to_square, filled on first use
+_MOVE_TABLE: Dict[int, Move] = {}
+
+
+_PIECES_BY_TOKEN = {chr(_SERIAL_TOKENS[code]): _PIECES_BY_CODE[code] for code in _PIECE_CODES.values()}
+
+# plain dict lookups for decoding enum names, avoiding EnumMeta.__getitem__ per field
+_PLAYER_BY_NAME = {player.name: player for player in Player}
+_PIECE_TYPE_BY_NAME = {piece_type.name: piece_type for piece_type in PieceType}
+_GAME_OVER_REASON_BY_NAME = {reason.name: reason for reason in GameOverReason}
+_PIECES_BY_NAMES = {(piece.type.name, piece.player.name): piece for piece in _PIECES_BY_CODE[1:]}
+
+
+def _decode_position(data: dict) -> Position:
+    """Decode a position, reusing the interned instance for on-board squares."""
+
+    x, y = data["x"], data["y"]
+    if 0 <= x < Board.width and 0 <= y < Board.height:
+        return _POSITIONS[y * Board.width + x]
+    return Position(x, y)
+
+
+def _encode_name(member: Optional[Enum]) -> Optional[str]:
+    return member.name if member else None
+
+
+def _decode_optional_piece_type(name: Optional[str]) -> Optional[PieceType]:
+    return _PIECE_TYPE_BY_NAME[name] if name is not None else None
+
+
+def _decode_optional_player(name: Optional[str]) -> Optional[Player]:
+    return _PLAYER_BY_NAME[name] if name is not None else None
+
+
+def _decode_optional_game_over_reason(name: Optional[str]) -> Optional[GameOverReason]:
+    return _GAME_OVER_REASON_BY_NAME[name] if name is not None else None
+
+
+def _encode_pieces(pieces: Dict[Tuple[int, int], Piece]) -> str:
+    """Encode a pieces mapping as a ``Board.serialize()`` string."""
+
+    serialized = bytearray(Board._EMPTY_SERIALIZED)
+    for (x, y), piece in pieces.items():
+        serialized[y * (Board.width + 1) + x] = _SERIAL_TOKENS[_PIECE_CODES[piece.type]]
+    return serialized.decode("ascii")
+
+
+@lru_cache(maxsize=4096)
+def _decode_serialized_pieces(data: str) -> Dict[Tuple[int, int], Piece]:
+    """Decode and validate a serialized board string; raise ``ValueError`` if it is malformed.
+
+    Shared by ``Board.deserialize`` and game log decoding, where a log's pieces_after
+    is the next record's pieces_before. The returned mapping is cached, so callers
+    must copy it before changing it.
+    """
+
+    rows = data.split("/")
+    if len(rows) != Board.height:
+        raise ValueError("Serialized board has an unexpected number of rows.")
+
+    pieces = {}
+    for y, row in enumerate(rows):
+        if len(row) != Board.width:
+            raise ValueError("Serialized board has an unexpected row width.")
+        for x, char in enumerate(row):
+            if char == ".":
+                continue
+            piece = _PIECES_BY_TOKEN.get(char)
+            if piece is None:
+                raise ValueError(f"Unknown piece token: {char}")
+            pieces[(x, y)] = piece
+    return pieces
+
+
+def _decode_pieces(data: str | List[dict]) -> Dict[Tuple[int, int], Piece]:
+    """Decode a serialized board string, or the older list-of-dicts format."""
+
+    if isinstance(data, str):
+        # each record gets its own copy; the cached mapping is shared
+        return dict(_decode_serialized_pieces(data))
+    return {
+        (item["pos"][0], item["pos"][1]): _PIECES_BY_NAMES.get((item["piece_type"], item["player"]))
+        or Piece(_PIECE_TYPE_BY_NAME[item["piece_type"]], _PLAYER_BY_NAME[item["player"]])
+        for item in data
+    }
+
+
 @dataclass_json
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MoveRecord:
     move_number: int
-    from_pos: Position
-    to_pos: Position
+    from_pos: Position = field(metadata=config(decoder=_decode_position))
+    to_pos: Position = field(metadata=config(decoder=_decode_position))
     player: Player = field(
-        metadata=config(encoder=lambda e: e.name, decoder=lambda v: Player[v])
+        metadata=config(encoder=lambda e: e.name, decoder=_PLAYER_BY_NAME.__getitem__)
     )
     piece_type: PieceType = field(
-        metadata=config(encoder=lambda e: e.name, decoder=lambda v: PieceType[v])
+        metadata=config(encoder=lambda e: e.name, decoder=_PIECE_TYPE_BY_NAME.__getitem__)
     )
     pieces_before: Dict[Tuple[int, int], Piece] = field(
-        metadata=config(
-            encoder=lambda pieces: [
-                {
-                    "pos": [x, y],
-                    "piece_type": piece.type.name,
-                    "player": piece.player.name,
-                }
-                for (x, y), piece in pieces.items()
-            ],
-            decoder=lambda items: {
-                (item["pos"][0], item["pos"][1]): Piece(
-                    PieceType[item["piece_type"]],
-                    Player[item["player"]],
-                )
-                for item in items
-            },
-        )
+        metadata=config(encoder=_encode_pieces, decoder=_decode_pieces)
     )
     pieces_after: Dict[Tuple[int, int], Piece] = field(
-        metadata=config(
-            encoder=lambda pieces: [
-                {
-                    "pos": [x, y],
-                    "piece_type": piece.type.name,
-                    "player": piece.player.name,
-                }
-                for (x, y), piece in pieces.items()
-            ],
-            decoder=lambda items: {
-                (item["pos"][0], item["pos"][1]): Piece(
-                    PieceType[item["piece_type"]],
-                    Player[item["player"]],
-                )
-                for item in items
-            },
-        )
+        metadata=config(encoder=_encode_pieces, decoder=_decode_pieces)
     )
     captured_piece: Optional[PieceType] = field(
         default=None,
-        metadata=config(
-            encoder=lambda e: e.name if e else None,
-            decoder=lambda v: PieceType[v] if v is not None else None,
-        ),
+        metadata=config(encoder=_encode_name, decoder=_decode_optional_piece_type),
     )
     winner_after_move: Optional[Player] = field(
         default=None,
-        metadata=config(
-            encoder=lambda e: e.name if e else None,
-            decoder=lambda v: Player[v] if v is not None else None,
-        ),
+        metadata=config(encoder=_encode_name, decoder=_decode_optional_player),
     )
     game_over_reason: Optional[GameOverReason] = field(
         default=None,
-        metadata=config(
-            encoder=lambda e: e.name if e else None,
-            decoder=lambda v: GameOverReason[v] if v is not None else None,
-        ),
+        metadata=config(encoder=_encode_name, decoder=_decode_optional_game_over_reason),
     )
+
+    @classmethod
+    def from_json_line(cls, line: str | bytes) -> "MoveRecord":
+        """Decode one line of a JSONL game log.
+
+        Produces the same record as ``from_json`` but applies the field decoders
+        directly; ``from_json`` re-resolves the dataclass type hints for every record,
+        which dominates reading game logs.
+        """
+
+        data = _json_loads(line)
+        return cls(
+            move_number=data["move_number"],
+            from_pos=_decode_position(data["from_pos"]),
+            to_pos=_decode_position(data["to_pos"]),
+            player=_PLAYER_BY_NAME[data["player"]],
+            piece_type=_PIECE_TYPE_BY_NAME[data["piece_type"]],
+            pieces_before=_decode_pieces(data["pieces_before"]),
+            pieces_after=_decode_pieces(data["pieces_after"]),
+            captured_piece=_decode_optional_piece_type(data.get("captured_piece")),
+            winner_after_move=_decode_optional_player(data.get("winner_after_move")),
+            game_over_reason=_decode_optional_game_over_reason(data.get("game_over_reason")),
+        )
+
+    def to_json_line(self) -> str:
+        """Encode the record as one JSONL line, the same text ``to_json`` produces.
+
+        Like :meth:`from_json_line`, this applies the field encoders directly instead of
+        going through the generic ``dataclasses_json`` machinery for every record.
+        """
+
+        return self._json_line(_encode_pieces(self.pieces_before), _encode_pieces(self.pieces_after))
+
+    @staticmethod
+    def iter_json_lines(records: Iterable["MoveRecord"]) -> Iterator[str]:
+        """Yield newline-terminated ``to_json_line`` text for consecutive records of a game.
+
+        A record's ``pieces_before`` is usually the previous record's ``pieces_after``, so
+        each board is encoded once and its text reused for the following record.
+        """
+
+        last_after: Optional[Dict[Tuple[int, int], Piece]] = None
+        last_after_text = ""
+        for record in records:
+            if last_after is not None and record.pieces_before == last_after:
+                before_text = last_after_text
+            else:
+                before_text = _encode_pieces(record.pieces_before)
+            last_after = record.pieces_after
+            last_after_text = _encode_pieces(last_after)
+            yield f"{record._json_line(before_text, last_after_text)}\n"
+
+    def _json_line(self, pieces_before: str, pieces_after: str) -> str:
+        from_pos = self.from_pos
+        to_pos = self.to_pos
+        return json.dumps(
+            {
+                "move_number": self.move_number,
+                "from_pos": {"x": from_pos.x, "y": from_pos.y},
+                "to_pos": {"x": to_pos.x, "y": to_pos.y},
+                "player": self.player.name,
+                "piece_type": self.piece_type.name,
+                "pieces_before": pieces_before,
+                "pieces_after": pieces_after,
+                "captured_piece": _encode_name(self.captured_piece),
+                "winner_after_move": _encode_name(self.winner_after_move),
+                "game_over_reason": _encode_name(self.game_over_reason),
+            }
+        )
+
+
+class VectorBoard:
+    """``n`` boards stepped in lockstep, one row of an ``(n, width * height)`` uint8 grid each.
+
+    Grids hold the same per-square piece codes as :class:`Board` and ``current_player``
+    holds ``Player.value`` per board. Buffalo turns and win checks run across all boards
+    in single NumPy ops; hunter turns go through :meth:`board` and :meth:`set_board`.
+    """
+
+    width: int = Board.width
+    height: int = Board.height
+
+    def __init__(self, n: int) -> None:
+        self.grids = np.tile(Board()._grid_array, (n, 1))
+        self.current_player = np.full(n, Player.BUFFALO.value, dtype=np.int8)
+
+    @classmethod
+    def from_boards(cls, boards: List[Board]) -> "VectorBoard":
+        vector_board = cls(0)
+        vector_board.grids = np.stack([board._grid_array for board in boards])
+        vector_board.current_player = np.array([board.current_player.value for board in boards], dtype=np.int8)
+        return vector_board
+
+    def __len__(self) -> int:
+        return len(self.grids)
+
+    def board(self, index: int) -> Board:
+        """Return board ``index`` as a standalone :class:`Board`."""
+
+        board = Board()
+        board._clear()
+        grid = self.grids[index]
+        for square in np.flatnonzero(grid).tolist():
+            board._put(square, int(grid[square]))
+        board.current_player = Player(int(self.current_player[index]))
+        return board
+
+    def set_board(self, index: int, board: Board) -> None:
+        self.grids[index] = board._grid_array
+        self.current_player[index] = board.current_player.value
+
+    def movable_buffalo(self) -> np.ndarray:
+        """Return an ``(n, width * height)`` bool mask of buffalo that can advance on their turn."""
+
+        width = self.width
+        grids = self.grids
+        movable = np.zeros(grids.shape, dtype=bool)
+        movable[:, :-width] = (grids[:, :-width] == _BUFFALO_CODE) & (grids[:, width:] == _EMPTY)
+        movable &= (self.current_player == Player.BUFFALO.value)[:, None]
+        return movable
+
+    def sample_buffalo_moves(self, rng: np.random.Generator) -> np.ndarray:
+        """Draw a uniformly random movable buffalo per board; -1 where none can move."""
+
+        movable = self.movable_buffalo()
+        from_squares = np.where(movable, rng.random(movable.shape), -1.0).argmax(axis=1)
+        from_squares[~movable.any(axis=1)] = -1
+        return from_squares
+
+    def advance_buffalo(self, from_squares: np.ndarray) -> None:
+        """Move the buffalo on ``from_squares`` one row down and hand those boards to the hunters.
+
+        Boards with a negative entry are left untouched.
+        """
+
+        rows = np.flatnonzero(from_squares >= 0)
+        squares = from_squares[rows]
+        if not self.movable_buffalo()[rows, squares].all():
+            raise ValueError("Invalid move")
+        self.grids[rows, squares] = _EMPTY
+        self.grids[rows, squares + self.width] = _BUFFALO_CODE
+        self.current_player[rows] = Player.HUNTERS.value
+
+    def buffalo_crossed(self) -> np.ndarray:
+        return (self.grids[:, Board._BOTTOM_ROW_START :] == _BUFFALO_CODE).any(axis=1)
+
+    def buffalo_stuck(self) -> np.ndarray:
+        return (self.current_player == Player.BUFFALO.value) & ~self.movable_buffalo().any(axis=1)
+
+    def buffalo_extinct(self) -> np.ndarray:
+        return ~(self.grids == _BUFFALO_CODE).any(axis=1)
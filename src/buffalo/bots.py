@@ -1,13 +1,25 @@
 import random
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from importlib import import_module
+from typing import List, Optional
 
-import torch
+from .board import Board, Move, Player
 
-from buffalo.encoders import BoardStateEncoder
-from buffalo.models import BuffaloQNetwork
+# The torch-backed bots import torch, which dominates start-up, so resolve them on first
+# access (PEP 562); random self-play and every simulator worker then skip the torch import.
+_LAZY_BOTS = {
+    "TorchBuffalo": ".torch_bots",
+    "TrainedTorchBuffalo": ".torch_bots",
+}
 
-from .board import Board, Move, Player
+
+def __getattr__(name: str):
+    module_name = _LAZY_BOTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __package__), name)
+    globals()[name] = value
+    return value
 
 
 class Bot(ABC):
@@ -15,12 +27,15 @@ class Bot(ABC):
         self.board = board
         self.player = player
 
-    def generate_legal_moves(self) -> List[Move]:
-        """Generate all legal moves for this bot's player."""
-
+    def _assert_turn(self) -> None:
         assert (
             self.board.current_player == self.player
         ), f"Bot can only generate moves on its turn, but got {self.board.current_player=}"
+
+    def generate_legal_moves(self) -> List[Move]:
+        """Generate all legal moves for this bot's player."""
+
+        self._assert_turn()
         return self.board.legal_moves()
 
     @abstractmethod
@@ -33,10 +48,12 @@ class Bot(ABC):
     def _choose_random_legal_move(
         self,
     ) -> Optional[Move]:
-        legal_moves = self.generate_legal_moves()
-        if not legal_moves:
+        self._assert_turn()
+        # pick among packed codes and only build the chosen Move
+        move_codes = self.board.legal_move_codes()
+        if not move_codes:
             return None
-        return random.choice(legal_moves)
+        return self.board.unpack_move(random.choice(move_codes))
 
 
 class NaiveBuffalo(Bot):
@@ -46,7 +63,16 @@ class NaiveBuffalo(Bot):
     def choose_move(
         self,
     ) -> Optional[Move]:
-        return self._choose_random_legal_move()
+        # every buffalo move is a one-row advance, so draw uniformly from the movable
+        # buffalo bitboard instead of building the legal move list
+        self._assert_turn()
+        movable = self.board.movable_buffalo()
+        if not movable:
+            return None
+        for _ in range(random.randrange(movable.bit_count())):
+            movable &= movable - 1
+        from_square = (movable & -movable).bit_length() - 1
+        return self.board.unpack_move((from_square << 7) | (from_square + self.board.width))
 
 
 class NaiveHunter(Bot):
@@ -58,73 +84,3 @@ class NaiveHunter(Bot):
     ) -> Optional[Move]:
 
         return self._choose_random_legal_move()
-
-
-class TorchBuffalo(Bot):
-    def __init__(
-        self,
-        board: Board,
-        model_path: Optional[str] = None,
-        device: Optional[str] = None,
-    ) -> None:
-        super().__init__(board, Player.BUFFALO)
-        self.board_state_encoder = BoardStateEncoder()
-
-        state_size = self.board_state_encoder.state_size
-        action_size = self.board_state_encoder.buffalo_action_size
-        self.dqn = BuffaloQNetwork(state_size, action_size)
-        torch_device = torch.device(device) if device else None
-        if model_path is not None:
-            print(f"Loading model from {model_path}")
-            payload = torch.load(model_path, map_location=torch_device or "cpu")
-            self.dqn.load_state_dict(payload["state_dict"])
-        if torch_device:
-            self.dqn.to(torch_device)
-
-    def load_model(self, model_path: str, device: Optional[str] = None) -> None:
-        torch_device = torch.device(device) if device else None
-        payload = torch.load(model_path, map_location=torch_device or "cpu")
-        self.dqn.load_state_dict(payload["state_dict"])
-        if torch_device:
-            self.dqn.to(torch_device)
-
-    def choose_move(
-        self,
-    ) -> Optional[Move]:
-
-        legal_moves = self.generate_legal_moves()
-        encoded_state_action_space = self.board_state_encoder.joint_state_action_encoder(
-            self.board,
-            legal_moves,
-        )
-
-        assert len(legal_moves) == encoded_state_action_space.shape[0]
-
-        q_hat = self.dqn(encoded_state_action_space)
-
-        assert q_hat.shape[0] == len(legal_moves)
-
-        chosen_move_idx = torch.argmax(q_hat).item()
-
-        return legal_moves[chosen_move_idx]
-
-    def encode_board_state(self) -> torch.Tensor:
-        return self.board_state_encoder.encode(self.board)
-
-    def encode_state_action_(self) -> torch.Tensor:
-        legal_moves = self.generate_legal_moves()
-
-        return self.board_state_encoder.joint_state_action_encoder(
-            self.board,
-            legal_moves,
-        )
-
-
-class TrainedTorchBuffalo(TorchBuffalo):
-    def __init__(
-        self,
-        board: Board,
-        model_path: Optional[str] = None,
-        device: Optional[str] = None,
-    ) -> None:
-        super().__init__(board, model_path="trained_models", device="cpu")
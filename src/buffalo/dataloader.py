@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
-from typing import Iterable, Iterator, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
+import numpy as np
 import torch
-from torch.utils.data import IterableDataset
+from torch.utils.data import IterableDataset, get_worker_info
 
-from .board import Board, Move, MoveRecord, PieceType, Player
+from .board import Board, Move, MoveRecord, Piece, PieceType, Player
 from .encoders import BoardStateEncoder
 
 
@@ -20,8 +22,29 @@ def _iter_jsonl_files(root: Path) -> Iterable[Path]:
         yield root
 
 
+def _compact_one_hot(array: np.ndarray) -> np.ndarray:
+    """Return ``array`` as ``uint8`` when it only holds 0s and 1s, unchanged otherwise."""
+
+    compact = array.astype(np.uint8)
+    return compact if np.array_equal(compact, array) else array
+
+
 class BaseGameDataset(IterableDataset, ABC):
-    """Base dataset for extracting transitions from JSONL game logs."""
+    """Base dataset for extracting transitions from JSONL game logs.
+
+    Under a multi-worker ``DataLoader`` each worker reads a disjoint subset of the
+    files, so parsing and encoding scale with ``num_workers``.
+
+    With ``cache_path`` set, the first complete single-process pass also writes the
+    encoded transitions there as ``.npy`` arrays, and later passes read them back
+    memory-mapped instead of parsing and encoding the logs again. One-hot tensors are
+    stored as ``uint8`` and converted back to ``float32`` per transition. The manifest
+    records the dataset class, the log files with their sizes and modification times,
+    the players, the reward settings and the encoder sizes; a cache written under any
+    other configuration is ignored and rebuilt by the next single-process pass.
+    """
+
+    _CACHE_FIELDS = ("states", "actions", "rewards", "next_states")
 
     def __init__(
         self,
@@ -33,8 +56,10 @@ class BaseGameDataset(IterableDataset, ABC):
         loss_reward: float = -1.0,
         capture_delta: float = 0.0,
         capture_piece: Optional[PieceType] = None,
+        cache_path: Optional[str | Path] = None,
     ) -> None:
         self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
         self.encoder = encoder or BoardStateEncoder()
         self.win_reward = win_reward
         self.loss_reward = loss_reward
@@ -44,33 +69,140 @@ class BaseGameDataset(IterableDataset, ABC):
         self.curr_player = curr_player
 
     def __iter__(self) -> Iterator[Tuple[torch.Tensor, torch.Tensor, float, torch.Tensor]]:
-        for path in _iter_jsonl_files(self.root):
+        worker_info = get_worker_info()
+        paths = list(_iter_jsonl_files(self.root))
+        cache_key = self._cache_key(paths) if self.cache_path is not None else None
+        if cache_key is not None and self._cache_matches(cache_key):
+            yield from self._iter_cache(worker_info)
+            return
+
+        if worker_info is not None:
+            # files are independent games, so workers can split them without coordination
+            paths = paths[worker_info.id :: worker_info.num_workers]
+
+        if self.cache_path is None or worker_info is not None:
+            yield from self._iter_transitions(paths)
+            return
+
+        transitions = []
+        for transition in self._iter_transitions(paths):
+            transitions.append(transition)
+            yield transition
+        self._write_cache(transitions, cache_key)
+
+    def _cache_key(self, paths: List[Path]) -> Dict[str, Any]:
+        """Describe everything the cached transitions depend on, in JSON-compatible values."""
+
+        files = []
+        for path in paths:
+            stat = path.stat()
+            files.append([str(path.resolve()), stat.st_size, stat.st_mtime_ns])
+        return {
+            "dataset": type(self).__name__,
+            "root": str(self.root.resolve()),
+            "files": files,
+            "prev_player": self.prev_player.name,
+            "curr_player": self.curr_player.name,
+            "win_reward": self.win_reward,
+            "loss_reward": self.loss_reward,
+            "capture_delta": self.capture_delta,
+            "capture_piece": self.capture_piece.name if self.capture_piece is not None else None,
+            "state_size": self.encoder.state_size,
+            "buffalo_action_size": self.encoder.buffalo_action_size,
+            "chief_action_size": self.encoder.chief_action_size,
+            "joint_dog_action_size": self.encoder.joint_dog_action_size,
+        }
+
+    def _cache_matches(self, cache_key: Dict[str, Any]) -> bool:
+        manifest_path = self.cache_path / "manifest.json"
+        if not manifest_path.exists():
+            return False
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        return manifest.get("key") == cache_key
+
+    def _iter_cache(self, worker_info) -> Iterator[Tuple[torch.Tensor, torch.Tensor, float, torch.Tensor]]:
+        # copy-on-write maps give writable arrays without reading the files up front
+        states, actions, rewards, next_states = (
+            np.load(self.cache_path / f"{name}.npy", mmap_mode="c") for name in self._CACHE_FIELDS
+        )
+        indices = range(len(rewards))
+        if worker_info is not None:
+            indices = indices[worker_info.id :: worker_info.num_workers]
+        for index in indices:
+            yield (
+                torch.from_numpy(states[index]).float(),
+                torch.from_numpy(actions[index]).float(),
+                float(rewards[index]),
+                torch.from_numpy(next_states[index]).float(),
+            )
+
+    def _write_cache(
+        self,
+        transitions: List[Tuple[torch.Tensor, torch.Tensor, float, torch.Tensor]],
+        cache_key: Dict[str, Any],
+    ) -> None:
+        if not transitions:
+            return
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        # drop any stale manifest first, so arrays half-replaced below are never read under it
+        (self.cache_path / "manifest.json").unlink(missing_ok=True)
+        states, actions, rewards, next_states = zip(*transitions)
+        arrays = (
+            _compact_one_hot(torch.stack(states).numpy()),
+            _compact_one_hot(torch.stack(actions).numpy()),
+            # float64 like the Python floats yielded uncached, so replayed rewards are identical
+            np.asarray(rewards, dtype=np.float64),
+            _compact_one_hot(torch.stack(next_states).numpy()),
+        )
+        for name, array in zip(self._CACHE_FIELDS, arrays):
+            np.save(self.cache_path / f"{name}.npy", array)
+        # written last, so a cache interrupted mid-write is never read
+        manifest = {"key": cache_key, "count": len(transitions)}
+        manifest.update({f"{name}_shape": list(array.shape) for name, array in zip(self._CACHE_FIELDS, arrays)})
+        (self.cache_path / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    def _iter_transitions(self, paths: List[Path]) -> Iterator[Tuple[torch.Tensor, torch.Tensor, float, torch.Tensor]]:
+        # bind per-transition lookups to locals once, outside the record loop
+        prev_player = self.prev_player
+        curr_player = self.curr_player
+        encode_pieces = self.encoder.encode_pieces
+        encode_action = self._encode_action
+        reward_from_row = self._reward_from_row
+        iter_records = self._iter_records
+
+        for path in paths:
             previous_row: Optional[MoveRecord] = None
-            for record in self._iter_records(path):
+            # (pieces, player, encoded state) of the last board_after; it is usually the
+            # next transition's board_before, so its encoding is reused
+            last_after: Optional[Tuple[Dict[Tuple[int, int], Piece], Player, torch.Tensor]] = None
+            for record in iter_records(path):
                 if previous_row is None:
                     previous_row = record
                     continue
 
-                if (
-                    previous_row.player != self.prev_player
-                    or record.player != self.curr_player
-                ):
+                if previous_row.player is not prev_player or record.player is not curr_player:
                     previous_row = record
                     continue
 
-                board_before = Board.from_pieces(previous_row.pieces_before, previous_row.player)
-                next_player = Player.HUNTERS if record.player == Player.BUFFALO else Player.BUFFALO
-                board_after = Board.from_pieces(record.pieces_after, next_player)
+                if (
+                    last_after is not None
+                    and last_after[1] == previous_row.player
+                    and last_after[0] == previous_row.pieces_before
+                ):
+                    state = last_after[2]
+                else:
+                    state = encode_pieces(previous_row.pieces_before, previous_row.player)
+                next_player = Player.HUNTERS if record.player is Player.BUFFALO else Player.BUFFALO
+                next_state = encode_pieces(record.pieces_after, next_player)
+                last_after = (record.pieces_after, next_player, next_state)
 
-                state = self.encoder.encode(board_before)
-                next_state = self.encoder.encode(board_after)
-                action = self._encode_action(previous_row, board_before, board_after)
+                action = encode_action(previous_row)
 
                 if action is None:
                     previous_row = record
                     continue
 
-                reward = self._reward_from_row(record)
+                reward = reward_from_row(record)
 
                 yield state, action, reward, next_state
                 previous_row = record
@@ -81,7 +213,7 @@ class BaseGameDataset(IterableDataset, ABC):
                 line = line.strip()
                 if not line:
                     continue
-                yield MoveRecord.from_json(line)
+                yield MoveRecord.from_json_line(line)
 
     def _reward_from_row(self, row: MoveRecord) -> float:
         reward = 0.0
@@ -98,12 +230,7 @@ class BaseGameDataset(IterableDataset, ABC):
         return reward
 
     @abstractmethod
-    def _encode_action(
-        self,
-        previous_row: MoveRecord,
-        board_before: Board,
-        board_after: Board,
-    ) -> Optional[torch.Tensor]:
+    def _encode_action(self, previous_row: MoveRecord) -> Optional[torch.Tensor]:
         raise NotImplementedError
 
 
@@ -121,6 +248,7 @@ class BuffaloGameDataset(BaseGameDataset):
         win_reward: float = 1.0,
         loss_reward: float = -1.0,
         capture_penalty: float = -0.1,
+        cache_path: Optional[str | Path] = None,
     ) -> None:
         super().__init__(
             root=root,
@@ -131,22 +259,17 @@ class BuffaloGameDataset(BaseGameDataset):
             capture_piece=PieceType.BUFFALO,
             prev_player=Player.BUFFALO,
             curr_player=Player.HUNTERS,
+            cache_path=cache_path,
         )
+        # row i is the action for a buffalo move on file i; rows are cloned per transition
+        self._file_one_hot = torch.eye(self.encoder.buffalo_action_size, dtype=torch.float32)
 
-    def _encode_action(
-        self,
-        previous_row: MoveRecord,
-        board_before: Board,
-        board_after: Board,
-    ) -> Optional[torch.Tensor]:
+    def _encode_action(self, previous_row: MoveRecord) -> Optional[torch.Tensor]:
         from_pos = previous_row.from_pos
-        to_pos = previous_row.to_pos
-        piece = board_before.get_piece_at(from_pos.x, from_pos.y)
-        if piece is None:
+        if (from_pos.x, from_pos.y) not in previous_row.pieces_before:
             return None
-        move = Move(player=Player.BUFFALO, piece=piece, start=from_pos, end=to_pos)
-        joint = self.encoder.joint_state_action_encoder(board_before, [move])
-        return joint[0, self.encoder.state_size :]
+        # the buffalo action is just the file, so no Board or Move is needed
+        return self._file_one_hot[from_pos.x].clone()
 
 
 class HunterGameDataset(BaseGameDataset):
@@ -163,6 +286,7 @@ class HunterGameDataset(BaseGameDataset):
         win_reward: float = 1.0,
         loss_reward: float = -1.0,
         capture_reward: float = 0.1,
+        cache_path: Optional[str | Path] = None,
     ) -> None:
         super().__init__(
             root=root,
@@ -173,19 +297,15 @@ class HunterGameDataset(BaseGameDataset):
             capture_piece=PieceType.BUFFALO,
             prev_player=Player.HUNTERS,
             curr_player=Player.BUFFALO,
+            cache_path=cache_path,
         )
 
-    def _encode_action(
-        self,
-        previous_row: MoveRecord,
-        board_before: Board,
-        board_after: Board,
-    ) -> Optional[torch.Tensor]:
+    def _encode_action(self, previous_row: MoveRecord) -> Optional[torch.Tensor]:
         from_pos = previous_row.from_pos
         to_pos = previous_row.to_pos
-        piece = board_before.get_piece_at(from_pos.x, from_pos.y)
+        piece = previous_row.pieces_before.get((from_pos.x, from_pos.y))
         if piece is None:
             return None
+        board_before = Board.from_pieces(previous_row.pieces_before, previous_row.player)
         move = Move(player=Player.HUNTERS, piece=piece, start=from_pos, end=to_pos)
-        joint = self.encoder.joint_state_action_encoder(board_before, [move])
-        return joint[0, self.encoder.state_size :]
+        return self.encoder.encode_action_only(board_before, move)
@@ -6,9 +6,8 @@ constructing a Q-network, and sampling experience using a replay buffer.
 
 from __future__ import annotations
 
-from collections import deque
 from dataclasses import dataclass
-from typing import Deque, Iterable, NamedTuple, Optional, Tuple
+from typing import Iterable, NamedTuple, Optional, Tuple
 import random
 
 import torch
@@ -43,19 +42,38 @@ class QNetwork(nn.Module):
 
 
 class Transition(NamedTuple):
+    """A batch of experience as returned by ``ReplayBuffer.sample``.
+
+    Each field stacks ``batch_size`` transitions along dimension 0; ``reward`` and
+    ``done`` are ``float32`` vectors, with ``done`` holding 1.0 for terminal steps.
+    """
+
     state: torch.Tensor
     action: torch.Tensor
-    reward: float
+    reward: torch.Tensor
     next_state: torch.Tensor
-    done: bool
+    done: torch.Tensor
 
 
 class ReplayBuffer:
-    """Fixed-size buffer to store experience tuples."""
+    """Fixed-size ring buffer storing experience as one contiguous tensor per field.
 
-    def __init__(self, capacity: int = 10000):
+    State and action storage is allocated on the first push, sized from that
+    transition. Once full, new transitions overwrite the oldest ones. With
+    ``pin_memory`` (and CUDA available) sampled batches land in page-locked memory,
+    so they can be copied to the GPU with ``non_blocking=True``.
+    """
+
+    def __init__(self, capacity: int = 10000, pin_memory: bool = False):
         self.capacity = capacity
-        self.buffer: Deque[Transition] = deque(maxlen=capacity)
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+        self.states: Optional[torch.Tensor] = None
+        self.actions: Optional[torch.Tensor] = None
+        self.next_states: Optional[torch.Tensor] = None
+        self.rewards = torch.empty(capacity, dtype=torch.float32)
+        self.dones = torch.empty(capacity, dtype=torch.float32)
+        self._size = 0
+        self._next_index = 0
 
     def push(
         self,
@@ -65,14 +83,40 @@ class ReplayBuffer:
         next_state: torch.Tensor,
         done: bool,
     ) -> None:
-        self.buffer.append(Transition(state, action, reward, next_state, done))
+        if self.states is None:
+            self.states = torch.empty((self.capacity, *state.shape), dtype=state.dtype)
+            self.actions = torch.empty((self.capacity, *action.shape), dtype=action.dtype)
+            self.next_states = torch.empty((self.capacity, *next_state.shape), dtype=next_state.dtype)
+
+        index = self._next_index
+        self.states[index] = state
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.next_states[index] = next_state
+        self.dones[index] = float(done)
+        self._next_index = (index + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
 
     def sample(self, batch_size: int) -> Transition:
-        batch = random.sample(self.buffer, batch_size)
-        return Transition(*zip(*batch))
+        """Return ``batch_size`` distinct transitions, each field stacked into one tensor."""
+
+        indices = torch.tensor(random.sample(range(self._size), batch_size), dtype=torch.long)
+        return Transition(
+            self._gather(self.states, indices),
+            self._gather(self.actions, indices),
+            self._gather(self.rewards, indices),
+            self._gather(self.next_states, indices),
+            self._gather(self.dones, indices),
+        )
+
+    def _gather(self, storage: torch.Tensor, indices: torch.Tensor) -> torch.Tensor:
+        if not self.pin_memory:
+            return storage[indices]
+        out = torch.empty((len(indices), *storage.shape[1:]), dtype=storage.dtype, pin_memory=True)
+        return torch.index_select(storage, 0, indices, out=out)
 
     def __len__(self) -> int:
-        return len(self.buffer)
+        return self._size
 
 
 class ReplayBufferDataset(IterableDataset):
@@ -86,13 +130,7 @@ class ReplayBufferDataset(IterableDataset):
         while True:
             if len(self.replay_buffer) < self.batch_size:
                 continue
-            batch = self.replay_buffer.sample(self.batch_size)
-            states = torch.stack(batch.state)
-            actions = torch.stack(batch.action)
-            rewards = torch.tensor(batch.reward, dtype=torch.float32)
-            next_states = torch.stack(batch.next_state)
-            dones = torch.tensor(batch.done, dtype=torch.float32)
-            yield states, actions, rewards, next_states, dones
+            yield tuple(self.replay_buffer.sample(self.batch_size))
 
 
 def compute_reward(board: Board, player: Player) -> float:
@@ -105,7 +143,15 @@ def compute_reward(board: Board, player: Player) -> float:
 
 @dataclass
 class DQNAgent:
-    """Minimal Deep Q-learning agent."""
+    """Minimal Deep Q-learning agent.
+
+    Targets bootstrap from the best of ``action_set``, the ``(A, action_size)``
+    candidate actions scored in the next state. It defaults to the one-hot actions
+    ``torch.eye(action_size)``, which only fits one-hot action spaces such as the
+    buffalo file actions. Hunter actions (a chief direction one-hot plus two dog
+    planes) are not identity rows, so callers training hunters must pass the
+    candidate hunter action vectors as ``action_set``.
+    """
 
     state_size: int
     action_size: int = 4
@@ -113,13 +159,20 @@ class DQNAgent:
     lr: float = 1e-3
     buffer_size: int = 10000
     batch_size: int = 64
+    device: str = "cpu"
+    action_set: Optional[torch.Tensor] = None
 
     def __post_init__(self) -> None:
-        self.q_network = QNetwork(self.state_size, self.action_size)
-        self.target_network = QNetwork(self.state_size, self.action_size)
+        self._device = torch.device(self.device)
+        if self.action_set is None:
+            self.action_set = torch.eye(self.action_size)
+        self._action_set = self.action_set.to(self._device, dtype=torch.float32)
+        self.q_network = QNetwork(self.state_size, self.action_size).to(self._device)
+        self.target_network = QNetwork(self.state_size, self.action_size).to(self._device)
         self.target_network.load_state_dict(self.q_network.state_dict())
         self.optimizer = torch.optim.Adam(self.q_network.parameters(), lr=self.lr)
-        self.replay_buffer = ReplayBuffer(self.buffer_size)
+        # pinned batches let the host-to-device copies below run asynchronously
+        self.replay_buffer = ReplayBuffer(self.buffer_size, pin_memory=self._device.type == "cuda")
 
     def remember(
         self,
@@ -134,17 +187,12 @@ class DQNAgent:
     def update(self) -> Optional[float]:
         if len(self.replay_buffer) < self.batch_size:
             return None
-        batch = self.replay_buffer.sample(self.batch_size)
-        states = torch.stack(batch.state)
-        actions = torch.stack(batch.action)
-        rewards = torch.tensor(batch.reward, dtype=torch.float32)
-        next_states = torch.stack(batch.next_state)
-        dones = torch.tensor(batch.done, dtype=torch.float32)
+        states, actions, rewards, next_states, dones = (
+            tensor.to(self._device, non_blocking=True) for tensor in self.replay_buffer.sample(self.batch_size)
+        )
 
         q_values = self.q_network(states, actions)
-        with torch.no_grad():
-            next_q_values = self.target_network(next_states, actions)
-            targets = rewards + self.gamma * next_q_values * (1 - dones)
+        targets = self._bootstrap_targets(rewards, next_states, dones)
 
         loss = nn.functional.mse_loss(q_values, targets)
         self.optimizer.zero_grad()
@@ -152,5 +200,17 @@ class DQNAgent:
         self.optimizer.step()
         return loss.item()
 
+    @torch.no_grad()
+    def _bootstrap_targets(self, rewards: torch.Tensor, next_states: torch.Tensor, dones: torch.Tensor) -> torch.Tensor:
+        # score every candidate action in each next state with one batched pass; the
+        # (batch, actions, features) views are only materialized by the network's cat
+        batch_size = next_states.size(0)
+        n_actions = self._action_set.size(0)
+        next_q_values = self.target_network(
+            next_states.unsqueeze(1).expand(-1, n_actions, -1),
+            self._action_set.expand(batch_size, -1, -1),
+        )
+        return rewards + self.gamma * next_q_values.max(dim=1).values * (1 - dones)
+
     def update_target(self) -> None:
         self.target_network.load_state_dict(self.q_network.state_dict())
@@ -2,11 +2,34 @@
 
 from __future__ import annotations
 
-from typing import List, Sequence
+from typing import Dict, List, Mapping, Sequence, Tuple
 
+import numpy as np
 import torch
 
-from .board import Board, Move, PieceType, Player, Position
+from .board import Board, Move, Piece, PieceType, Player, Position
+
+
+# chief step (dx, dy) -> index of its direction one-hot
+_CHIEF_DIRECTIONS = {
+    (0, -1): 0,  # up
+    (0, 1): 1,  # down
+    (-1, 0): 2,  # left
+    (1, 0): 3,  # right
+    (1, -1): 4,  # up-right
+    (-1, -1): 5,  # up-left
+    (1, 1): 6,  # down-right
+    (-1, 1): 7,  # down-left
+}
+
+
+def _expand_square_masks(masks: Sequence[int], n_squares: int) -> torch.Tensor:
+    """Expand square bitmasks (bit ``y * width + x``) into a ``(len(masks), n_squares)`` 0/1 tensor."""
+
+    n_bytes = (n_squares + 7) // 8
+    packed = np.frombuffer(b"".join(mask.to_bytes(n_bytes, "little") for mask in masks), dtype=np.uint8)
+    bits = np.unpackbits(packed.reshape(len(masks), n_bytes), axis=1, bitorder="little")[:, :n_squares]
+    return torch.from_numpy(bits.astype(np.float32))
 
 
 class BoardStateEncoder:
@@ -28,29 +51,68 @@ class BoardStateEncoder:
         ]
         # +1 for player turn state
         self.state_size = board_width * board_height * len(self.piece_types) + 1
+        self._piece_type_index: Dict[PieceType, int] = {
+            piece_type: index for index, piece_type in enumerate(self.piece_types)
+        }
+        # rows 0-7 are the chief direction one-hots, row 8 the all-zero "no chief step" row
+        self._chief_direction_rows = torch.cat(
+            [torch.eye(len(_CHIEF_DIRECTIONS), dtype=torch.float32), torch.zeros(1, len(_CHIEF_DIRECTIONS))]
+        )
+        # row i is the one-hot action for a buffalo move on file i
+        self._buffalo_file_one_hot = torch.eye(board_width, dtype=torch.float32)
+        # buffalo file per packed move code ``(from_square << 7) | to_square``, -1 for non-buffalo moves
+        square_count = board_width * board_height
+        self._buffalo_move_index = torch.full((square_count << 7,), -1, dtype=torch.long)
+        for from_square in range(square_count - board_width):
+            self._buffalo_move_index[(from_square << 7) | (from_square + board_width)] = from_square % board_width
 
     def encode(self, board: Board) -> torch.Tensor:
         """Return a one-hot encoded representation of ``board``."""
 
-        state = torch.zeros(self.state_size, dtype=torch.float32)
-        for (x, y), piece in board.pieces.items():
-            square_index = y * self.board_width + x
-            type_index = self.piece_types.index(piece.type)
-            index = square_index * len(self.piece_types) + type_index
-            state[index] = 1.0
-        state[-1] = 1.0 if board.current_player == Player.HUNTERS else 0.0
-        return state
+        return self.encode_into(board, torch.empty(self.state_size, dtype=torch.float32))
+
+    def encode_into(self, board: Board, out: torch.Tensor) -> torch.Tensor:
+        """Write the :meth:`encode` vector of ``board`` into ``out`` and return it.
+
+        Every entry of ``out`` is overwritten, so callers encoding many positions can
+        allocate one ``(n, state_size)`` buffer and fill its rows.
+        """
+
+        # Board.to_numpy() planes come in self.piece_types order; moving the plane axis
+        # last gives the square-major layout, written in a single copy
+        out[:-1] = torch.from_numpy(board.to_numpy().transpose(1, 2, 0).reshape(-1))
+        out[-1] = 1.0 if board.current_player == Player.HUNTERS else 0.0
+        return out
+
+    def encode_pieces(self, pieces: Mapping[Tuple[int, int], Piece], current_player: Player) -> torch.Tensor:
+        """Return the :meth:`encode` vector of a position given as a pieces mapping.
+
+        Writes the one-hot entries straight from ``pieces``, without building a
+        :class:`Board` first.
+        """
+
+        width = self.board_width
+        n_types = len(self.piece_types)
+        type_index = self._piece_type_index
+        state = np.zeros(self.state_size, dtype=np.float32)
+        state[[(y * width + x) * n_types + type_index[piece.type] for (x, y), piece in pieces.items()]] = 1.0
+        state[-1] = 1.0 if current_player == Player.HUNTERS else 0.0
+        return torch.from_numpy(state)
 
     def buffalo_move_one_hot_encoder(self, legal_buffalo_moves: List[Move]) -> torch.Tensor:
         """Return a one-hot vector of legal buffalo files."""
 
-        n_moves: int = len(legal_buffalo_moves)
+        files = [move.start.x for move in legal_buffalo_moves]
+        assert all(move.end.x == x for move, x in zip(legal_buffalo_moves, files)), "Buffalo moves must be vertical"
+        # gather rows of the identity in one indexing op instead of per-move element writes
+        return self._buffalo_file_one_hot[torch.tensor(files, dtype=torch.long)]
+
+    def buffalo_move_code_one_hot_encoder(self, move_codes: List[int]) -> torch.Tensor:
+        """Return a one-hot vector of buffalo files for moves packed by ``Board.legal_move_codes``."""
 
-        move_tensor = torch.zeros((n_moves, self.board_width), dtype=torch.float32)
-        for i, move in enumerate(legal_buffalo_moves):
-            assert move.start.x == move.end.x, "Buffalo moves must be vertical"
-            move_tensor[i, move.start.x] = 1.0
-        return move_tensor
+        files = self._buffalo_move_index[torch.tensor(move_codes, dtype=torch.long)]
+        assert bool((files >= 0).all()), "Buffalo moves must be vertical"
+        return self._buffalo_file_one_hot[files]
 
     def buffalo_joint_state_action_encoder(
         self,
@@ -81,6 +143,16 @@ class BoardStateEncoder:
         encoded_actions = self._hunter_move_action_encoder(board, legal_moves)
         return self._hunter_joint_state_action_encoder(encoded_state, encoded_actions)
 
+    def encode_action_only(self, board: Board, move: Move) -> torch.Tensor:
+        """Encode a single move of ``board`` without the state part of the joint vector.
+
+        Equivalent to ``joint_state_action_encoder(board, [move])[0, state_size:]``.
+        """
+
+        if move.player == Player.BUFFALO:
+            return self._buffalo_file_one_hot[move.start.x].clone()
+        return self._hunter_move_action_encoder(board, [move])[0]
+
     def _hunter_joint_state_action_encoder(
         self,
         encoded_board_state: torch.Tensor,
@@ -108,53 +180,30 @@ class BoardStateEncoder:
         if not legal_moves:
             return torch.zeros((0, action_size), dtype=torch.float32)
 
-        dogs_before = self._encode_dog_positions(board)
-        actions: List[torch.Tensor] = []
+        # dog positions stay bitmasks per move and are expanded to dense planes in one batch;
+        # hunter moves never capture a dog, so only a dog's own step changes the mask
+        width = board.width
+        dogs_before = board.bb_dog
+        chief_indices: List[int] = []
+        dog_masks = [dogs_before]
         for move in legal_moves:
-            chief_action = self._encode_chief_direction(move.start, move.end, move.piece.type)
-            board_after = self._apply_move(board, move)
-            dogs_after = self._encode_dog_positions(board_after)
-            actions.append(torch.cat([chief_action, dogs_before, dogs_after], dim=0))
-        return torch.stack(actions, dim=0)
-
-    def _encode_dog_positions(self, board: Board) -> torch.Tensor:
-        flat = torch.zeros(self.board_width * self.board_height, dtype=torch.float32)
-        for (x, y), piece in board.pieces.items():
-            if piece.type == PieceType.DOG:
-                flat[y * self.board_width + x] = 1.0
-        return flat
-
-    def _encode_chief_direction(
-        self,
-        from_pos: Position,
-        to_pos: Position,
-        piece_type: PieceType,
-    ) -> torch.Tensor:
-        direction = torch.zeros(8, dtype=torch.float32)
-        if piece_type != PieceType.CHIEF:
-            return direction
-        dx = to_pos.x - from_pos.x
-        dy = to_pos.y - from_pos.y
-        mapping = {
-            (0, -1): 0,  # up
-            (0, 1): 1,  # down
-            (-1, 0): 2,  # left
-            (1, 0): 3,  # right
-            (1, -1): 4,  # up-right
-            (-1, -1): 5,  # up-left
-            (1, 1): 6,  # down-right
-            (-1, 1): 7,  # down-left
-        }
-        index = mapping.get((dx, dy))
-        if index is not None:
-            direction[index] = 1.0
-        return direction
-
-    def _apply_move(self, board: Board, move: Move) -> Board:
-        cloned = Board.deserialize(board.serialize())
-        cloned.current_player = move.player
-        cloned.move_piece(move.start.x, move.start.y, move.end.x, move.end.y, with_record=False)
-        return cloned
+            chief_indices.append(self._chief_direction_index(move.start, move.end, move.piece.type))
+            if move.piece.type == PieceType.DOG:
+                from_bit = 1 << (move.start.y * width + move.start.x)
+                to_bit = 1 << (move.end.y * width + move.end.x)
+                dog_masks.append((dogs_before & ~from_bit) | to_bit)
+            else:
+                dog_masks.append(dogs_before)
+        dog_planes = _expand_square_masks(dog_masks, board.width * board.height)
+        # one gather for the chief rows and one cat into the output; the dogs-before plane is broadcast
+        chief_actions = self._chief_direction_rows[torch.tensor(chief_indices, dtype=torch.long)]
+        return torch.cat([chief_actions, dog_planes[:1].expand(len(legal_moves), -1), dog_planes[1:]], dim=1)
+
+    def _chief_direction_index(self, from_pos: Position, to_pos: Position, piece_type: PieceType) -> int:
+        # row of _chief_direction_rows for the move; the last row is the all-zero "no chief step"
+        if piece_type == PieceType.CHIEF:
+            return _CHIEF_DIRECTIONS.get((to_pos.x - from_pos.x, to_pos.y - from_pos.y), len(_CHIEF_DIRECTIONS))
+        return len(_CHIEF_DIRECTIONS)
 
     @property
     def buffalo_action_size(self) -> int:
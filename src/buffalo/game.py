@@ -39,6 +39,14 @@ class Game:
         self.winner = None
         self.game_over_reason: Optional[GameOverReason] = None
 
+    def reset(self) -> None:
+        """Start a new game on the same board and controllers."""
+
+        self.board.reset()
+        self.history = []
+        self.winner = None
+        self.game_over_reason = None
+
     @property
     def game_over(self) -> bool:
         return self.winner is not None
@@ -83,6 +91,4 @@ class Game:
 
     def write_history(self, game_path: str):
         with open(game_path, "w", encoding="utf-8") as handle:
-            for record in self.history:
-                handle.write(record.to_json())
-                handle.write("\n")
+            handle.writelines(MoveRecord.iter_json_lines(self.history))
@@ -1,9 +1,11 @@
 import importlib
 import logging
-from typing import Optional, Tuple
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 
 import arcade
 import click
+from arcade.shape_list import ShapeElementList, create_line, create_rectangle_filled
 
 from .board import Board, GameOverReason, PieceType, Player
 from .bots import NaiveBuffalo, NaiveHunter
@@ -24,6 +26,9 @@ PANEL_LINE_HEIGHT = 18
 PANEL_MAX_LINES = 28
 BOARD_PIXEL_WIDTH = BOARD_WIDTH * SQUARE_SIZE
 HEIGHT = BOARD_HEIGHT * SQUARE_SIZE
+# seconds between redraws while bots are moving, and while waiting for a click or after game over
+ACTIVE_DRAW_RATE = 1 / 60
+IDLE_DRAW_RATE = 1 / 5
 
 
 LIGHT = (240, 217, 181)
@@ -36,6 +41,8 @@ PIECE_COLORS = {
     PieceType.CHIEF: (255, 215, 0),  # Gold
 }
 
+PIECE_DIAMETER = int(2 * SQUARE_SIZE / 3)
+
 TEXT_COLORS = {
     PieceType.BUFFALO: (255, 255, 255),  # White
     PieceType.DOG: (0, 0, 0),  # Black
@@ -76,8 +83,46 @@ class GameWindow(arcade.Window):
         self.max_frames = max_frames
         self.bot_delay = 0.25
         self.bot_elapsed = 0.0
-        self._history_cache = []
+        # formatted lines of the most recent moves; older lines fall off the left end
+        self._history_cache: Deque[str] = deque(maxlen=PANEL_MAX_LINES)
         self._history_count = 0
+        # sidebar labels are laid out once; history lines only get new text when a move is added
+        header_x = BOARD_PIXEL_WIDTH + PANEL_PADDING
+        header_y = HEIGHT - PANEL_PADDING
+        self._history_header = arcade.Text(
+            "Move History",
+            header_x,
+            header_y,
+            PANEL_HEADER,
+            font_size=16,
+            anchor_x="left",
+            anchor_y="top",
+        )
+        first_line_y = header_y - (PANEL_LINE_HEIGHT * 1.6)
+        self._history_lines = [
+            arcade.Text(
+                "",
+                header_x,
+                first_line_y - i * PANEL_LINE_HEIGHT,
+                PANEL_TEXT,
+                font_size=12,
+                anchor_x="left",
+                anchor_y="top",
+            )
+            for i in range(PANEL_MAX_LINES)
+        ]
+        # piece letters laid out once per (x, y, piece type) and reused every frame
+        self._piece_labels: Dict[Tuple[int, int, PieceType], arcade.Text] = {}
+        self._board_shapes = self._build_board_shapes()
+        # piece discs are sprites drawn as one batch; rebuilt only when the position changes
+        self._piece_textures = {
+            piece_type: arcade.make_circle_texture(PIECE_DIAMETER, color) for piece_type, color in PIECE_COLORS.items()
+        }
+        self._piece_sprites = arcade.SpriteList()
+        self._piece_sprite_labels: List[arcade.Text] = []
+        self._piece_sprites_key: Optional[int] = None
+        # nothing on screen changes until the first click, so redraw rarely until then
+        self.set_draw_rate(IDLE_DRAW_RATE)
 
     def on_draw(self) -> None:
         self.clear()
@@ -113,29 +158,32 @@ class GameWindow(arcade.Window):
         # start the game upon first click
         if not self.started:
             self.started = True
+            self.set_draw_rate(ACTIVE_DRAW_RATE)
             return
 
     def draw_board(self) -> None:
+        self._board_shapes.draw()
+
+    def _build_board_shapes(self) -> ShapeElementList:
+        # the board never changes, so its squares and lines are uploaded once and drawn in one call
+        shapes = ShapeElementList()
         for y in range(BOARD_HEIGHT):
             for x in range(BOARD_WIDTH):
                 color = LIGHT if (x + y) % 2 == 0 else DARK
                 center_x, center_y = to_screen_center(x, y)
-                arcade.draw_lbwh_rectangle_filled(
-                    center_x - SQUARE_SIZE / 2,
-                    center_y - SQUARE_SIZE / 2,
-                    SQUARE_SIZE,
-                    SQUARE_SIZE,
-                    color,
-                )
-        arcade.draw_line(
-            0,
-            HEIGHT - SQUARE_SIZE,
-            BOARD_PIXEL_WIDTH,
-            HEIGHT - SQUARE_SIZE,
-            LINE_COLOR,
-            4,
+                shapes.append(create_rectangle_filled(center_x, center_y, SQUARE_SIZE, SQUARE_SIZE, color))
+        shapes.append(
+            create_line(
+                0,
+                HEIGHT - SQUARE_SIZE,
+                BOARD_PIXEL_WIDTH,
+                HEIGHT - SQUARE_SIZE,
+                LINE_COLOR,
+                4,
+            )
         )
-        arcade.draw_line(0, SQUARE_SIZE, BOARD_PIXEL_WIDTH, SQUARE_SIZE, LINE_COLOR, 4)
+        shapes.append(create_line(0, SQUARE_SIZE, BOARD_PIXEL_WIDTH, SQUARE_SIZE, LINE_COLOR, 4))
+        return shapes
 
     def draw_sidebar(self) -> None:
         arcade.draw_lbwh_rectangle_filled(
@@ -146,61 +194,64 @@ class GameWindow(arcade.Window):
             PANEL_BG,
         )
 
-        header_x = BOARD_PIXEL_WIDTH + PANEL_PADDING
-        header_y = HEIGHT - PANEL_PADDING
-        arcade.draw_text(
-            "Move History",
-            header_x,
-            header_y,
-            PANEL_HEADER,
-            font_size=16,
-            anchor_x="left",
-            anchor_y="top",
-        )
+        self._history_header.draw()
+
+        history = self.game.history
+        if len(history) != self._history_count:
+            if len(history) < self._history_count:
+                self._history_cache.clear()
+                self._history_count = 0
+            # format only the moves added since the last refresh
+            for record in history[max(self._history_count, len(history) - PANEL_MAX_LINES) :]:
+                self._history_cache.append(
+                    f"{record.move_number:03d} {record.player.name} "
+                    f"{Board.from_pieces(record.pieces_after, Player.BUFFALO).serialize()}"
+                )
+            self._history_count = len(history)
+            for label, line in zip(self._history_lines, self._history_cache):
+                label.text = line
 
-        if len(self.game.history) != self._history_count:
-            self._history_count = len(self.game.history)
-            recent = self.game.history[-PANEL_MAX_LINES:]
-            self._history_cache = [
-                f"{record.move_number:03d} {record.player.name} "
-                f"{Board.from_pieces(record.pieces_after, Player.BUFFALO).serialize()}"
-                for record in recent
-            ]
-
-        text_y = header_y - (PANEL_LINE_HEIGHT * 1.6)
-        for line in self._history_cache:
-            arcade.draw_text(
-                line,
-                header_x,
-                text_y,
-                PANEL_TEXT,
-                font_size=12,
-                anchor_x="left",
-                anchor_y="top",
-            )
-            text_y -= PANEL_LINE_HEIGHT
+        for label in self._history_lines[: len(self._history_cache)]:
+            label.draw()
 
     def draw_pieces(self) -> None:
-        for x in range(BOARD_WIDTH):
-            for y in range(BOARD_HEIGHT):
-                piece = self.game.board.get_piece_at(x, y)
-                if piece:
-                    center_x, center_y = to_screen_center(x, y)
-                    arcade.draw_circle_filled(
-                        center_x,
-                        center_y,
-                        SQUARE_SIZE / 3,
-                        PIECE_COLORS[piece.type],
-                    )
-                    arcade.draw_text(
-                        piece.type.value,
-                        center_x,
-                        center_y,
-                        TEXT_COLORS[piece.type],
-                        font_size=18,
-                        anchor_x="center",
-                        anchor_y="center",
-                    )
+        if self.game.board.zobrist_key != self._piece_sprites_key:
+            self._rebuild_piece_sprites()
+        self._piece_sprites.draw()
+        for label in self._piece_sprite_labels:
+            label.draw()
+
+    def _rebuild_piece_sprites(self) -> None:
+        board = self.game.board
+        self._piece_sprites.clear()
+        labels = []
+        # board.pieces iterates the occupied squares only, not all 77
+        for (x, y), piece in board.pieces.items():
+            center_x, center_y = to_screen_center(x, y)
+            self._piece_sprites.append(
+                arcade.Sprite(self._piece_textures[piece.type], center_x=center_x, center_y=center_y)
+            )
+            labels.append(self._piece_label(x, y, piece.type))
+        self._piece_sprite_labels = labels
+        self._piece_sprites_key = board.zobrist_key
+
+    def _piece_label(self, x: int, y: int, piece_type: PieceType) -> arcade.Text:
+        # draw_text builds a new label on every call; keep one per square and piece type instead
+        key = (x, y, piece_type)
+        label = self._piece_labels.get(key)
+        if label is None:
+            center_x, center_y = to_screen_center(x, y)
+            label = arcade.Text(
+                piece_type.value,
+                center_x,
+                center_y,
+                TEXT_COLORS[piece_type],
+                font_size=18,
+                anchor_x="center",
+                anchor_y="center",
+            )
+            self._piece_labels[key] = label
+        return label
 
     def draw_selected(self, pos: Tuple[int, int]) -> None:
         x, y = pos
@@ -227,6 +278,7 @@ class GameWindow(arcade.Window):
     ) -> None:
         if winner_after_move is not None:
             self.started = False
+            self.set_draw_rate(IDLE_DRAW_RATE)
             reason = game_over_reason.name if game_over_reason else "unknown"
             self.set_caption(f"YEEHAW: {winner_after_move.name} wins! Reason = {reason}")
         return None
@@ -1,10 +1,12 @@
-"""Random game simulation and CSV export for Buffalo."""
+"""Random game simulation and JSONL export for Buffalo."""
 
 from __future__ import annotations
 
+import multiprocessing
 import os
 import random
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 import importlib
 
@@ -14,6 +16,57 @@ from .board import Board
 from .game import Game, MoveRecord
 
 
+@lru_cache(maxsize=None)
+def _game_for_strategies(buffalo_strategy: str, hunter_strategy: str) -> Game:
+    """Build one board, controller pair and game per strategy pair and process.
+
+    Games are replayed on it after ``Game.reset()``, so bots that load a model do
+    so once per process rather than once per game.
+    """
+
+    bots_module = importlib.import_module("buffalo.bots")
+    buffalo_strategy_clazz = getattr(bots_module, buffalo_strategy)
+    hunter_strategy_clazz = getattr(bots_module, hunter_strategy)
+
+    board = Board()
+
+    buffalo_controller = buffalo_strategy_clazz(board)
+    hunter_controller = hunter_strategy_clazz(board)
+    assert buffalo_controller.board == hunter_controller.board
+    assert buffalo_controller.board == board
+
+    return Game(buffalo_controller=buffalo_controller, hunter_controller=hunter_controller, board=board)
+
+
+def _simulate_game(
+    i_game: int,
+    game_seed: Optional[int],
+    game_folder: str,
+    max_moves: int,
+    buffalo_strategy: str,
+    hunter_strategy: str,
+) -> str:
+    """Play one game and write its history; module-level so pool workers can run it."""
+
+    # the bots draw from the global generator, so seed it per game
+    random.seed(game_seed)
+
+    game = _game_for_strategies(buffalo_strategy, hunter_strategy)
+    game.reset()
+
+    while not game.game_over and game.board.move_number < max_moves:
+        game.step()
+
+    if game.board.move_number == max_moves:
+        print(f"Game {i_game} reached max moves of {max_moves} without a winner, skipping for now.")
+
+    game_filename: str = f"game-{i_game:09d}.jsonl"
+    game_path: str = os.path.join(game_folder, game_filename)
+
+    game.write_history(game_path)
+    return game_path
+
+
 @click.command()
 @click.option("--num-games", type=int, default=10, show_default=True)
 @click.option("--output-dir", type=str, default="simulated_games", show_default=True)
@@ -22,6 +75,7 @@ from .game import Game, MoveRecord
 @click.option("--seed", type=int, default=None)
 @click.option("--buffalo-strategy", type=str, default="NaiveBuffalo", show_default=True)
 @click.option("--hunter-strategy", type=str, default="NaiveHunter", show_default=True)
+@click.option("--workers", type=int, default=1, show_default=True, help="Processes to play games in parallel.")
 def main(
     num_games: int,
     output_dir: str,
@@ -30,36 +84,28 @@ def main(
     seed: Optional[int],
     buffalo_strategy: str,
     hunter_strategy: str,
+    workers: int,
 ) -> None:
-    seed = random.Random(seed)
-
-    bots_module = importlib.import_module("buffalo.bots")
-    buffalo_strategy_clazz = getattr(bots_module, buffalo_strategy)
-    hunter_strategy_clazz = getattr(bots_module, hunter_strategy)
-
-    for i_game in range(num_games):
-        board = Board()
-
-        buffalo_controller = buffalo_strategy_clazz(board)
-        hunter_controller = hunter_strategy_clazz(board)
-        assert buffalo_controller.board == hunter_controller.board
-        assert buffalo_controller.board == board
-
-        game = Game(buffalo_controller=buffalo_controller, hunter_controller=hunter_controller, board=board)
-
-        while not game.game_over and game.board.move_number < max_moves:
-            game.step()
-
-        if game.board.move_number == max_moves:
-            print(f"Game {i_game} reached max moves of {max_moves} without a winner, skipping for now.")
-
-        # TODO: log the game in the desired subfolder
-        game_filename: str = f"game-{i_game:09d}.jsonl"
-        game_folder: str = os.path.join(output_dir, simulation_name)
-        os.makedirs(game_folder, exist_ok=True)
-        game_path: str = os.path.join(game_folder, game_filename)
-
-        game.write_history(game_path)
+    seed_rng = random.Random(seed)
+    # one seed per game, drawn up front so results do not depend on the worker count
+    game_seeds = [seed_rng.getrandbits(64) if seed is not None else None for _ in range(num_games)]
+
+    # TODO: log the game in the desired subfolder
+    game_folder: str = os.path.join(output_dir, simulation_name)
+    os.makedirs(game_folder, exist_ok=True)
+
+    jobs = [
+        (i_game, game_seeds[i_game], game_folder, max_moves, buffalo_strategy, hunter_strategy)
+        for i_game in range(num_games)
+    ]
+    if workers <= 1:
+        for job in jobs:
+            _simulate_game(*job)
+        return
+
+    # games share no state, so each worker plays whole games independently
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        pool.starmap(_simulate_game, jobs)
 
 
 if __name__ == "__main__":
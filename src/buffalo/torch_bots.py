@@ -0,0 +1,93 @@
+"""Bots that choose moves with a trained Q-network."""
+
+from typing import List, Optional, Tuple
+
+import torch
+
+from .board import Board, Move, Player
+from .bots import Bot
+from .encoders import BoardStateEncoder
+from .models import BuffaloQNetwork
+
+
+class TorchBuffalo(Bot):
+    def __init__(
+        self,
+        board: Board,
+        model_path: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> None:
+        super().__init__(board, Player.BUFFALO)
+        self.board_state_encoder = BoardStateEncoder()
+        # (zobrist key, encoded state) of the last position encoded
+        self._state_cache: Optional[Tuple[int, torch.Tensor]] = None
+
+        state_size = self.board_state_encoder.state_size
+        action_size = self.board_state_encoder.buffalo_action_size
+        self.dqn = BuffaloQNetwork(state_size, action_size)
+        torch_device = torch.device(device) if device else None
+        if model_path is not None:
+            print(f"Loading model from {model_path}")
+            payload = torch.load(model_path, map_location=torch_device or "cpu")
+            self.dqn.load_state_dict(payload["state_dict"])
+        if torch_device:
+            self.dqn.to(torch_device)
+        # the bot only ever runs inference
+        self.dqn.eval()
+
+    def load_model(self, model_path: str, device: Optional[str] = None) -> None:
+        torch_device = torch.device(device) if device else None
+        payload = torch.load(model_path, map_location=torch_device or "cpu")
+        self.dqn.load_state_dict(payload["state_dict"])
+        if torch_device:
+            self.dqn.to(torch_device)
+
+    def choose_move(
+        self,
+    ) -> Optional[Move]:
+
+        self._assert_turn()
+        move_codes = self.board.legal_move_codes()
+        encoded_state_action_space = self._encode_state_action_space(move_codes)
+
+        assert len(move_codes) == encoded_state_action_space.shape[0]
+
+        with torch.inference_mode():
+            q_hat = self.dqn(encoded_state_action_space)
+
+        assert q_hat.shape[0] == len(move_codes)
+
+        chosen_move_idx = torch.argmax(q_hat).item()
+
+        return self.board.unpack_move(move_codes[chosen_move_idx])
+
+    def encode_board_state(self) -> torch.Tensor:
+        """Return the encoded board state, reusing it while the position is unchanged."""
+
+        key = self.board.zobrist_key
+        if self._state_cache is None or self._state_cache[0] != key:
+            self._state_cache = (key, self.board_state_encoder.encode(self.board))
+        return self._state_cache[1]
+
+    def encode_state_action_(self) -> torch.Tensor:
+        self._assert_turn()
+        return self._encode_state_action_space(self.board.legal_move_codes())
+
+    def _encode_state_action_space(self, move_codes: List[int]) -> torch.Tensor:
+        # legal moves are always buffalo moves here, so skip the encoder's player dispatch;
+        # the state row is broadcast across the moves rather than copied
+        encoder = self.board_state_encoder
+        return encoder.buffalo_joint_state_action_encoder(
+            self.encode_board_state(),
+            encoder.buffalo_move_code_one_hot_encoder(move_codes),
+        )
+
+
+class TrainedTorchBuffalo(TorchBuffalo):
+    def __init__(
+        self,
+        board: Board,
+        model_path: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> None:
+        super().__init__(board, model_path="trained_models", device="cpu")
@@ -1,31 +1,72 @@
-"""Training loop for a Buffalo Q-network using saved game CSVs."""
+"""Training loop for a Buffalo Q-network using saved game JSONL logs."""
 
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 import click
 import torch
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, default_collate
 
 from .dataloader import BuffaloGameDataset
 from .encoders import BoardStateEncoder
 from .models import BuffaloQNetwork
 
 
+class CudaPrefetcher:
+    """Iterate ``loader`` while copying the next batch to ``device`` on a side CUDA stream.
+
+    The host-to-device copy of batch N+1 is issued before batch N is handed out, so it
+    overlaps with the forward and backward pass instead of preceding it.
+    """
+
+    def __init__(self, loader: Iterable[Tuple[torch.Tensor, ...]], device: torch.device) -> None:
+        self.loader = loader
+        self.device = device
+        self.stream = torch.cuda.Stream(device=device)
+
+    def __iter__(self) -> Iterator[Tuple[torch.Tensor, ...]]:
+        batches = iter(self.loader)
+        batch = self._preload(batches)
+        while batch is not None:
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_stream(self.stream)
+            # the tensors were allocated on the side stream but are consumed on this one
+            for tensor in batch:
+                tensor.record_stream(current_stream)
+            next_batch = self._preload(batches)
+            yield batch
+            batch = next_batch
+
+    def _preload(self, batches: Iterator[Tuple[torch.Tensor, ...]]) -> Optional[Tuple[torch.Tensor, ...]]:
+        try:
+            batch = next(batches)
+        except StopIteration:
+            return None
+        with torch.cuda.stream(self.stream):
+            return tuple(tensor.to(self.device, non_blocking=True) for tensor in batch)
+
+
+def _collate_float32(batch: List[Tuple[torch.Tensor, torch.Tensor, float, torch.Tensor]]) -> List[torch.Tensor]:
+    # rewards arrive as Python floats and collate to float64; casting here, before the
+    # loader pins the batch, keeps the host-to-device copies asynchronous
+    return [tensor.float() for tensor in default_collate(batch)]
+
+
 def _max_next_q(
     model: BuffaloQNetwork,
     next_states: torch.Tensor,
-    action_size: int,
+    action_eye: torch.Tensor,
 ) -> torch.Tensor:
-    batch_size = next_states.size(0)
-    actions = torch.eye(action_size, device=next_states.device)
-    expanded_states = next_states.unsqueeze(1).expand(batch_size, action_size, -1)
-    expanded_actions = actions.unsqueeze(0).expand(batch_size, action_size, -1)
-    flat_states = expanded_states.reshape(-1, next_states.size(1))
-    flat_actions = expanded_actions.reshape(-1, action_size)
-    q_values = model(flat_states, flat_actions).view(batch_size, action_size)
+    batch_size, state_size = next_states.shape
+    action_size = action_eye.size(0)
+    # one contiguous (state, action) block per candidate action, fed to the model as a
+    # single joint input instead of two expanded copies that it would concatenate again
+    joint = next_states.new_empty(batch_size, action_size, state_size + action_size)
+    joint[:, :, :state_size] = next_states.unsqueeze(1)
+    joint[:, :, state_size:] = action_eye
+    q_values = model(joint.view(-1, state_size + action_size)).view(batch_size, action_size)
     return q_values.max(dim=1).values
 
 
@@ -37,37 +78,73 @@ def train(
     lr: float = 1e-3,
     gamma: float = 0.99,
     device: Optional[str] = None,
+    num_workers: int = 0,
+    prefetch_factor: int = 2,
+    cache_in_memory: bool = False,
+    compile_model: bool = False,
 ) -> BuffaloQNetwork:
     encoder = BoardStateEncoder()
     dataset = BuffaloGameDataset(data_dir, encoder=encoder)
-    loader = DataLoader(dataset, batch_size=batch_size)
-
     torch_device = torch.device(device) if device else None
+    is_cuda = torch_device is not None and torch_device.type == "cuda"
+    # pinned batches let the copies below run asynchronously while the loader collates the next one
+    pin_memory = is_cuda
+    # workers parse and encode disjoint game files while the main process trains
+    loader = DataLoader(
+        dataset,
+        batch_size=batch_size,
+        collate_fn=_collate_float32,
+        pin_memory=pin_memory,
+        num_workers=num_workers,
+        persistent_workers=num_workers > 0,
+        prefetch_factor=prefetch_factor if num_workers > 0 else None,
+    )
     model = BuffaloQNetwork(encoder.state_size, encoder.buffalo_action_size)
     if torch_device:
         model.to(torch_device)
+    # forward passes go through the compiled wrapper; the plain module owns the weights that are saved
+    forward = torch.compile(model) if compile_model else model
+    # every buffalo action is scored for each next state; the one-hot rows never change
+    action_eye = torch.eye(encoder.buffalo_action_size, device=torch_device)
 
-    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+    # one fused kernel per step on CUDA; elsewhere the per-parameter updates are batched with foreach
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr, fused=is_cuda, foreach=not is_cuda)
     loss_fn = torch.nn.MSELoss()
+    # on CUDA the forward passes run in float16; the scaler keeps small gradients from underflowing
+    scaler = torch.amp.GradScaler("cuda", enabled=is_cuda)
+
+    in_memory_batches = None
+    if cache_in_memory:
+        # parse and encode the logs once; every epoch then slices the stacked tensors
+        columns = [torch.cat(column).to(torch_device) for column in zip(*loader)]
+        in_memory_batches = list(zip(*(column.split(batch_size) for column in columns)))
 
     for _ in range(epochs):
-        for state, action, reward, next_state in loader:
-            if torch_device:
+        if in_memory_batches is not None:
+            batches = in_memory_batches
+        elif pin_memory:
+            batches = CudaPrefetcher(loader, torch_device)
+        else:
+            batches = loader
+        for state, action, reward, next_state in batches:
+            # cached and prefetched batches are already on the device
+            if torch_device and batches is loader:
                 state = state.to(torch_device)
                 action = action.to(torch_device)
                 reward = reward.to(torch_device)
                 next_state = next_state.to(torch_device)
-
-            reward = reward.float()
-            q_pred = model(state, action)
-            with torch.no_grad():
-                max_next_q = _max_next_q(model, next_state, encoder.buffalo_action_size)
-                target = reward + gamma * max_next_q
-
-            loss = loss_fn(q_pred, target)
-            optimizer.zero_grad()
-            loss.backward()
-            optimizer.step()
+            with torch.autocast("cuda", dtype=torch.float16, enabled=is_cuda):
+                q_pred = forward(state, action)
+                with torch.no_grad():
+                    max_next_q = _max_next_q(forward, next_state, action_eye)
+            # targets and the loss stay in float32
+            target = reward + gamma * max_next_q.float()
+
+            loss = loss_fn(q_pred.float(), target)
+            optimizer.zero_grad(set_to_none=True)
+            scaler.scale(loss).backward()
+            scaler.step(optimizer)
+            scaler.update()
 
     save_payload = {
         "state_dict": model.state_dict(),
@@ -86,6 +163,10 @@ def train(
 @click.option("--lr", type=float, default=1e-3, show_default=True)
 @click.option("--gamma", type=float, default=0.99, show_default=True)
 @click.option("--device", type=str, default=None)
+@click.option("--num-workers", type=int, default=4, show_default=True)
+@click.option("--prefetch-factor", type=int, default=2, show_default=True)
+@click.option("--cache-in-memory", is_flag=True, help="Encode the dataset once and keep it in memory across epochs.")
+@click.option("--compile", "compile_model", is_flag=True, help="Run the Q-network through torch.compile.")
 def main(
     data_dir: Path,
     save_path: Path,
@@ -94,6 +175,10 @@ def main(
     lr: float,
     gamma: float,
     device: Optional[str],
+    num_workers: int,
+    prefetch_factor: int,
+    cache_in_memory: bool,
+    compile_model: bool,
 ) -> None:
     train(
         data_dir=data_dir,
@@ -103,6 +188,10 @@ def main(
         lr=lr,
         gamma=gamma,
         device=device,
+        num_workers=num_workers,
+        prefetch_factor=prefetch_factor,
+        cache_in_memory=cache_in_memory,
+        compile_model=compile_model,
     )
 
 
@@ -1,6 +1,9 @@
+import json
+
+import numpy as np
 import pytest
 
-from buffalo.board import Board, Piece, PieceType, Player, GameOverReason
+from buffalo.board import Board, MoveRecord, Piece, PieceType, Player, GameOverReason, VectorBoard
 
 
 def test_initial_setup():
@@ -179,3 +182,247 @@ def test_deserialize_rejects_invalid_data():
     rows[0] = "X" + "." * (board.width - 1)
     with pytest.raises(ValueError):
         Board.deserialize("/".join(rows))
+
+
+def test_pieces_view_writes_through():
+    board = Board()
+
+    board.pieces[(0, 3)] = Piece(PieceType.DOG, Player.HUNTERS)
+    del board.pieces[(0, 0)]
+
+    assert board.get_piece_at(0, 3) == Piece(PieceType.DOG, Player.HUNTERS)
+    assert board.get_piece_at(0, 0) is None
+    assert (0, 0) not in board.pieces
+    assert len(board.pieces) == 16
+    assert board.serialize().split("/")[3] == "D.........."
+
+
+def test_legal_moves_match_is_valid_move():
+    board = Board.deserialize("BB.B.BBBBBB/..B.....D../.......D.../.....C...../...B......./.D....D..../...........")
+    for player in Player:
+        board.current_player = player
+        expected = {
+            ((from_x, from_y), (to_x, to_y))
+            for (from_x, from_y), piece in board.pieces.items()
+            if piece.player == player
+            for to_x in range(board.width)
+            for to_y in range(board.height)
+            if board._is_valid_move(piece, from_x, from_y, to_x, to_y)
+        }
+        actual = {((m.start.x, m.start.y), (m.end.x, m.end.y)) for m in board.legal_moves()}
+        assert actual == expected
+
+
+def test_legal_moves_cache_invalidated_on_change():
+    board = Board()
+
+    first = board.legal_moves()
+    assert board.legal_moves() is first
+    assert board.has_any_legal_move()
+
+    board.current_player = Player.HUNTERS
+    assert all(move.player == Player.HUNTERS for move in board.legal_moves())
+
+    board.current_player = Player.BUFFALO
+    board.pieces[(0, 1)] = Piece(PieceType.DOG, Player.HUNTERS)
+    assert len(board.legal_moves()) == board.width - 1
+
+
+def test_to_numpy_one_hot_planes():
+    board = Board()
+
+    planes = board.to_numpy()
+
+    assert planes.shape == (3, board.height, board.width)
+    assert planes[0, 0].tolist() == [1] * board.width
+    assert planes[1].sum() == 4
+    assert planes[1, 5, 3] == 1
+    assert planes[2, 5, 5] == 1
+    assert planes.sum() == len(board.pieces)
+
+
+def test_move_record_json_roundtrip():
+    board = Board()
+    _, _, _, record = board.move_piece(0, 0, 0, 1)
+
+    data = json.loads(record.to_json())
+    assert data["pieces_after"] == board.serialize()
+
+    restored = MoveRecord.from_json(record.to_json())
+    assert restored.pieces_before == Board().pieces
+    assert restored.pieces_after == board.pieces
+    assert MoveRecord.from_json_line(record.to_json()) == restored
+    assert record.to_json_line() == record.to_json()
+
+    # decoded boards are cached, but every record still owns its pieces mapping
+    again = MoveRecord.from_json_line(record.to_json())
+    assert again.pieces_after == restored.pieces_after
+    assert again.pieces_after is not MoveRecord.from_json_line(record.to_json()).pieces_after
+
+
+def test_move_record_reads_legacy_pieces_format():
+    board = Board()
+    _, _, _, record = board.move_piece(0, 0, 0, 1)
+    data = json.loads(record.to_json())
+    for key in ("pieces_before", "pieces_after"):
+        pieces = Board.deserialize(data[key]).pieces
+        data[key] = [
+            {"pos": [x, y], "piece_type": piece.type.name, "player": piece.player.name}
+            for (x, y), piece in pieces.items()
+        ]
+
+    restored = MoveRecord.from_json(json.dumps(data))
+
+    assert restored == record
+
+
+def test_move_record_rejects_malformed_pieces():
+    board = Board()
+    _, _, _, record = board.move_piece(0, 0, 0, 1)
+    valid = record.to_json_line()
+    serialized = board.serialize()
+
+    for bad in ("XYZ", serialized[:-1], serialized.replace("B", "X", 1), serialized.replace("/", ".", 1)):
+        data = json.loads(valid)
+        data["pieces_after"] = bad
+        with pytest.raises(ValueError):
+            MoveRecord.from_json_line(json.dumps(data))
+
+
+def test_reset_restores_the_starting_position():
+    board = Board()
+    board.move_piece(0, 0, 0, 1)
+    board.move_piece(3, 5, 3, 4)
+
+    board.reset()
+    fresh = Board()
+
+    assert board.serialize() == fresh.serialize()
+    assert board.zobrist_key == fresh.zobrist_key
+    assert board.current_player == Player.BUFFALO
+    assert board.move_number == 0
+    assert board.legal_moves() == fresh.legal_moves()
+    _, _, _, record = board.move_piece(0, 0, 0, 1)
+    assert record.pieces_before == fresh.pieces
+
+
+def test_zobrist_key_tracks_position_and_side_to_move():
+    first = Board()
+    first.move_piece(0, 0, 0, 1)
+    first.move_piece(3, 5, 3, 4)
+    first.move_piece(1, 0, 1, 1)
+
+    second = Board()
+    second.move_piece(1, 0, 1, 1)
+    second.move_piece(3, 5, 3, 4)
+    second.move_piece(0, 0, 0, 1)
+
+    assert first.zobrist_key == second.zobrist_key
+    assert first.zobrist_key == Board.from_pieces(dict(first.pieces), Player.HUNTERS).zobrist_key
+    assert first.zobrist_key != Board.from_pieces(dict(first.pieces), Player.BUFFALO).zobrist_key
+    assert first.zobrist_key != Board().zobrist_key
+
+
+def test_skip_stalemate_check_defers_stuck_detection():
+    board = Board()
+    board.pieces = {
+        (0, 0): Piece(PieceType.BUFFALO, Player.BUFFALO),
+        (1, 2): Piece(PieceType.DOG, Player.HUNTERS),
+    }
+    board.current_player = Player.HUNTERS
+
+    _, winner, reason, _ = board.move_piece(1, 2, 0, 1, skip_stalemate_check=True)
+
+    assert (winner, reason) == (None, None)
+    assert board.check_for_stalemate(board.legal_moves()) == (Player.HUNTERS, GameOverReason.BUFFALO_STUCK)
+    assert board.check_for_winner() == (Player.HUNTERS, GameOverReason.BUFFALO_STUCK)
+
+
+def test_bitboards_track_piece_placement():
+    board = Board()
+    assert board.bb_buf == (1 << board.width) - 1
+    assert board.occ == board.bb_buf | board.bb_dog | board.bb_chief
+    assert board.bb_chief == 1 << (5 * board.width + 5)
+
+    board.move_piece(0, 0, 0, 1)
+    assert board.bb_buf & (1 << board.width)
+    assert not board.bb_buf & 1
+
+    board.pieces[(2, 3)] = Piece(PieceType.DOG, Player.HUNTERS)
+    assert board.bb_dog & (1 << (3 * board.width + 2))
+    del board.pieces[(2, 3)]
+    assert board.occ == board.bb_buf | board.bb_dog | board.bb_chief
+    assert bin(board.occ).count("1") == len(board.pieces)
+    assert board.occupied_by(Player.BUFFALO) == board.bb_buf
+    assert board.occupied_by(Player.HUNTERS) == board.bb_dog | board.bb_chief
+
+
+def test_legal_moves_share_interned_move_instances():
+    first = Board().legal_moves()
+    second = Board().legal_moves()
+
+    assert first == second
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_legal_move_codes_unpack_to_legal_moves():
+    board = Board()
+    board.move_piece(0, 0, 0, 1)
+
+    codes = board.legal_move_codes()
+
+    assert [board.unpack_move(code) for code in codes] == board.legal_moves()
+    for code, move in zip(codes, board.legal_moves()):
+        assert code >> 7 == move.start.y * board.width + move.start.x
+        assert code & 0x7F == move.end.y * board.width + move.end.x
+
+
+def test_movable_buffalo_excludes_blocked_buffalo():
+    board = Board()
+    board.pieces = {
+        (0, 0): Piece(PieceType.BUFFALO, Player.BUFFALO),
+        (1, 0): Piece(PieceType.BUFFALO, Player.BUFFALO),
+        (1, 1): Piece(PieceType.DOG, Player.HUNTERS),
+        (2, 5): Piece(PieceType.BUFFALO, Player.BUFFALO),
+    }
+
+    assert board.movable_buffalo() == (1 << 0) | (1 << (5 * board.width + 2))
+
+
+def test_vector_board_buffalo_turns_match_board():
+    rng = np.random.default_rng(0)
+    boards = [Board() for _ in range(4)]
+    # hunters to move on board 1
+    boards[1].move_piece(2, 0, 2, 1)
+    vector_board = VectorBoard.from_boards(boards)
+
+    from_squares = vector_board.sample_buffalo_moves(rng)
+    assert from_squares[1] == -1
+    vector_board.advance_buffalo(from_squares)
+
+    for index, board in enumerate(boards):
+        square = int(from_squares[index])
+        if square >= 0:
+            x, y = square % board.width, square // board.width
+            board.move_piece(x, y, x, y + 1, with_record=False)
+        assert vector_board.board(index).serialize() == board.serialize()
+        assert vector_board.board(index).current_player is board.current_player
+
+    assert not vector_board.buffalo_crossed().any()
+    assert not vector_board.buffalo_extinct().any()
+
+
+def test_move_records_chain_and_see_external_edits():
+    board = Board()
+    *_, first = board.move_piece(3, 0, 3, 1)
+    *_, second = board.move_piece(5, 5, 5, 4)
+    assert second.pieces_before == first.pieces_after
+    assert second.pieces_before is not first.pieces_after
+
+    del board.pieces[(0, 0)]
+    *_, third = board.move_piece(1, 0, 1, 1)
+    assert (0, 0) not in third.pieces_before
+
+    # the shared board between first and second, and the break before third, both encode as before
+    records = [first, second, third]
+    assert list(MoveRecord.iter_json_lines(records)) == [f"{record.to_json_line()}\n" for record in records]
@@ -1,7 +1,9 @@
+import json
+
 import torch
 
 from buffalo.board import Board, MoveRecord, PieceType, Player, Position
-from buffalo.dataloader import BuffaloGameDataset
+from buffalo.dataloader import BuffaloGameDataset, HunterGameDataset
 from buffalo.encoders import BoardStateEncoder
 
 
@@ -65,3 +67,76 @@ def test_dataloader_reads_buffalo_hunter_pairs(tmp_path):
     assert action[0].item() == 1.0
     assert torch.sum(action).item() == 1.0
     assert reward == 0.0
+
+
+def test_dataloader_cache_replays_transitions(tmp_path):
+    board = Board()
+    records = []
+    for from_x, from_y, to_x, to_y in [(0, 0, 0, 1), (3, 5, 3, 4), (1, 0, 1, 1), (4, 5, 4, 4)]:
+        _, _, _, record = board.move_piece(from_x, from_y, to_x, to_y)
+        records.append(record.to_json())
+    (tmp_path / "game-1.jsonl").write_text("\n".join(records) + "\n", encoding="utf-8")
+
+    cache_path = tmp_path / "cache"
+    first = list(BuffaloGameDataset(tmp_path, cache_path=cache_path))
+    assert (cache_path / "manifest.json").exists()
+    second = list(BuffaloGameDataset(tmp_path, cache_path=cache_path))
+
+    assert len(first) == len(second) == 2
+    for expected, actual in zip(first, second):
+        assert torch.equal(expected[0], actual[0])
+        assert torch.equal(expected[1], actual[1])
+        assert expected[2] == actual[2]
+        assert torch.equal(expected[3], actual[3])
+
+
+def test_dataloader_cache_is_not_reused_under_another_configuration(tmp_path):
+    board = Board()
+    records = []
+    for from_x, from_y, to_x, to_y in [(0, 0, 0, 1), (3, 5, 3, 4), (1, 0, 1, 1), (4, 5, 4, 4), (2, 0, 2, 1)]:
+        _, _, _, record = board.move_piece(from_x, from_y, to_x, to_y)
+        records.append(record.to_json())
+    (tmp_path / "game-1.jsonl").write_text("\n".join(records) + "\n", encoding="utf-8")
+
+    cache_path = tmp_path / "cache"
+    list(BuffaloGameDataset(tmp_path, cache_path=cache_path))
+
+    # a hunter dataset must not replay the buffalo transitions; it rebuilds the cache instead
+    expected = list(HunterGameDataset(tmp_path))
+    # the first pass rebuilds the cache, the second replays it
+    for _ in range(2):
+        actual = list(HunterGameDataset(tmp_path, cache_path=cache_path))
+        assert len(actual) == len(expected) == 2
+        for want, got in zip(expected, actual):
+            assert torch.equal(want[0], got[0])
+            assert torch.equal(want[1], got[1])
+            assert want[2] == got[2]
+            assert torch.equal(want[3], got[3])
+
+    manifest_path = cache_path / "manifest.json"
+    assert json.loads(manifest_path.read_text(encoding="utf-8"))["key"]["dataset"] == "HunterGameDataset"
+
+    # different reward settings do not match either, and the rebuilt cache records them
+    list(HunterGameDataset(tmp_path, cache_path=cache_path, win_reward=5.0))
+    assert json.loads(manifest_path.read_text(encoding="utf-8"))["key"]["win_reward"] == 5.0
+
+
+def test_dataloader_cache_replays_fractional_rewards_exactly(tmp_path):
+    board = Board()
+    records = []
+    for from_x, from_y, to_x, to_y in [(0, 0, 0, 1), (3, 5, 3, 4), (1, 0, 1, 1), (4, 5, 4, 4)]:
+        _, _, _, record = board.move_piece(from_x, from_y, to_x, to_y)
+        data = json.loads(record.to_json())
+        if record.player is Player.HUNTERS:
+            # mark the hunter replies as captures so the capture penalty applies
+            data["captured_piece"] = PieceType.BUFFALO.name
+        records.append(json.dumps(data))
+    (tmp_path / "game-1.jsonl").write_text("\n".join(records) + "\n", encoding="utf-8")
+
+    cache_path = tmp_path / "cache"
+    uncached = list(BuffaloGameDataset(tmp_path, capture_penalty=-0.1))
+    list(BuffaloGameDataset(tmp_path, capture_penalty=-0.1, cache_path=cache_path))
+    cached = list(BuffaloGameDataset(tmp_path, capture_penalty=-0.1, cache_path=cache_path))
+
+    assert [reward for _, _, reward, _ in uncached] == [-0.1, -0.1]
+    assert [reward for _, _, reward, _ in cached] == [-0.1, -0.1]
@@ -0,0 +1,83 @@
+import torch
+from torch import nn
+
+from buffalo.dqn import DQNAgent, ReplayBuffer, ReplayBufferDataset
+
+
+class _PerActionValue(nn.Module):
+    """Stub Q-network whose value depends only on the action: ``action @ values``."""
+
+    def __init__(self, values):
+        super().__init__()
+        self.values = torch.tensor(values)
+
+    def forward(self, state, action):
+        return action @ self.values
+
+
+def test_update_targets_bootstrap_from_best_next_action():
+    action_set = torch.tensor([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    agent = DQNAgent(state_size=3, action_size=2, gamma=0.5, batch_size=2, action_set=action_set)
+    agent.target_network = _PerActionValue([1.0, 5.0])
+
+    rewards = torch.tensor([1.0, 2.0])
+    next_states = torch.zeros(2, 3)
+    dones = torch.tensor([0.0, 1.0])
+    # the stored (taken) action would score 1.0; the best candidate [1, 1] scores 6.0
+    targets = agent._bootstrap_targets(rewards, next_states, dones)
+
+    assert torch.allclose(targets, torch.tensor([1.0 + 0.5 * 6.0, 2.0]))
+
+    # update() trains against the same targets
+    states = torch.rand(2, 3)
+    taken = torch.tensor([[1.0, 0.0], [1.0, 0.0]])
+    for i in range(2):
+        agent.remember(states[i], taken[i], rewards[i].item(), next_states[i], bool(dones[i]))
+    with torch.no_grad():
+        expected_loss = nn.functional.mse_loss(agent.q_network(states, taken), targets).item()
+    assert abs(agent.update() - expected_loss) < 1e-6
+
+
+def _filled_buffer(capacity, pushes):
+    buffer = ReplayBuffer(capacity)
+    for i in range(pushes):
+        state = torch.full((3,), float(i))
+        buffer.push(state, torch.tensor([float(i), 0.0]), float(i), state + 0.5, i % 2 == 1)
+    return buffer
+
+
+def test_replay_buffer_overwrites_oldest_after_capacity():
+    buffer = _filled_buffer(capacity=4, pushes=6)
+
+    assert len(buffer) == 4
+    # pushes 4 and 5 wrapped around onto the slots of 0 and 1
+    assert buffer.rewards.tolist() == [4.0, 5.0, 2.0, 3.0]
+    assert buffer.states[:, 0].tolist() == [4.0, 5.0, 2.0, 3.0]
+    sampled = buffer.sample(4)
+    assert sorted(sampled.reward.tolist()) == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_replay_buffer_sample_shapes_and_dtypes():
+    buffer = _filled_buffer(capacity=8, pushes=5)
+
+    states, actions, rewards, next_states, dones = buffer.sample(3)
+
+    assert states.shape == (3, 3) and states.dtype == torch.float32
+    assert actions.shape == (3, 2) and actions.dtype == torch.float32
+    assert rewards.shape == (3,) and rewards.dtype == torch.float32
+    assert next_states.shape == (3, 3) and next_states.dtype == torch.float32
+    assert dones.shape == (3,) and dones.dtype == torch.float32
+    # fields of one sample stay aligned: reward i came with state i and done = i odd
+    assert torch.equal(states[:, 0], rewards)
+    assert torch.equal(next_states[:, 0], rewards + 0.5)
+    assert torch.equal(dones, rewards.remainder(2))
+
+
+def test_replay_buffer_dataset_yields_sampled_batches():
+    buffer = _filled_buffer(capacity=8, pushes=5)
+    batches = iter(ReplayBufferDataset(buffer, batch_size=2))
+
+    for _ in range(3):
+        batch = next(batches)
+        assert len(batch) == 5
+        assert [tensor.shape[0] for tensor in batch] == [2] * 5
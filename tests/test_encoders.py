@@ -77,6 +77,18 @@ def test_buffalo_move_one_hot_encoder_empty():
     assert torch.sum(one_hot).item() == 0.0
 
 
+def test_buffalo_move_code_one_hot_encoder_matches_move_encoder():
+    board = Board()
+    board.move_piece(3, 0, 3, 1)
+    board.move_piece(5, 5, 5, 4)
+    encoder = BoardStateEncoder()
+
+    one_hot = encoder.buffalo_move_code_one_hot_encoder(board.legal_move_codes())
+
+    assert torch.equal(one_hot, encoder.buffalo_move_one_hot_encoder(board.legal_moves()))
+    assert encoder.buffalo_move_code_one_hot_encoder([]).shape == (0, encoder.board_width)
+
+
 def test_buffalo_joint_state_action_encoder_broadcasts_state():
     encoder = BoardStateEncoder()
     encoded_state = torch.zeros(encoder.state_size, dtype=torch.float32)
@@ -98,3 +110,59 @@ def test_buffalo_joint_state_action_encoder_broadcasts_state():
     expanded_state = encoded_state.unsqueeze(0).expand(encoded_actions.size(0), -1)
     expected = torch.cat([expanded_state, encoded_actions], dim=1)
     assert torch.equal(joint, expected)
+
+
+def test_encode_action_only_matches_joint_action_tail():
+    board = Board()
+    encoder = BoardStateEncoder()
+
+    for _ in range(2):
+        for move in board.legal_moves():
+            joint = encoder.joint_state_action_encoder(board, [move])
+            assert torch.equal(encoder.encode_action_only(board, move), joint[0, encoder.state_size :])
+        move = board.legal_moves()[0]
+        board.move_piece(move.start.x, move.start.y, move.end.x, move.end.y)
+
+
+def test_encode_pieces_matches_encode():
+    board = Board()
+    board.move_piece(3, 0, 3, 1)
+    encoder = BoardStateEncoder()
+
+    for player in (Player.BUFFALO, Player.HUNTERS):
+        board.current_player = player
+        assert torch.equal(encoder.encode_pieces(board.pieces, player), encoder.encode(board))
+
+
+def test_hunter_actions_track_the_moved_dog():
+    board = Board()
+    board.move_piece(3, 0, 3, 1)
+    encoder = BoardStateEncoder()
+    dog_moves = [move for move in board.legal_moves() if move.piece.type == PieceType.DOG]
+    move = dog_moves[0]
+
+    action = encoder.encode_action_only(board, move)
+
+    squares = board.width * board.height
+    dogs_before = action[8 : 8 + squares]
+    dogs_after = action[8 + squares :]
+    start = move.start.y * board.width + move.start.x
+    end = move.end.y * board.width + move.end.x
+    assert torch.sum(action[:8]).item() == 0.0
+    assert dogs_before[start] == 1.0 and dogs_before[end] == 0.0
+    assert dogs_after[start] == 0.0 and dogs_after[end] == 1.0
+    assert torch.sum(dogs_after).item() == torch.sum(dogs_before).item()
+
+
+def test_encode_into_fills_rows_of_a_shared_buffer():
+    first = Board()
+    second = Board()
+    second.move_piece(3, 0, 3, 1)
+    encoder = BoardStateEncoder()
+    out = torch.full((2, encoder.state_size), 7.0)
+
+    for row, board in zip(out, (first, second)):
+        encoder.encode_into(board, row)
+
+    assert torch.equal(out[0], encoder.encode(first))
+    assert torch.equal(out[1], encoder.encode(second))
@@ -0,0 +1,46 @@
+from click.testing import CliRunner
+
+from buffalo.board import Board, MoveRecord, Player
+from buffalo.simulator import _game_for_strategies, _simulate_game, main
+
+
+def _read_records(path):
+    with open(path, encoding="utf-8") as handle:
+        return [MoveRecord.from_json_line(line) for line in handle if line.strip()]
+
+
+def test_reused_game_restarts_and_seed_reproduces_log(tmp_path):
+    folder = str(tmp_path)
+    first_path = _simulate_game(0, 123, folder, 5000, "NaiveBuffalo", "NaiveHunter")
+    game = _game_for_strategies("NaiveBuffalo", "NaiveHunter")
+    second_path = _simulate_game(1, 456, folder, 5000, "NaiveBuffalo", "NaiveHunter")
+
+    # the second game ran on the same cached Game, from the start and with a fresh history
+    assert _game_for_strategies("NaiveBuffalo", "NaiveHunter") is game
+    second = _read_records(second_path)
+    assert len(game.history) == len(second)
+    assert second[0].move_number == _read_records(first_path)[0].move_number
+    assert second[0].player is Player.BUFFALO
+    assert second[0].pieces_before == Board().pieces
+
+    # replaying the first seed on the reused game writes the same log
+    replay_path = _simulate_game(2, 123, folder, 5000, "NaiveBuffalo", "NaiveHunter")
+    with open(first_path, encoding="utf-8") as first, open(replay_path, encoding="utf-8") as replay:
+        assert first.read() == replay.read()
+
+
+def test_worker_pool_writes_the_same_games_as_one_process(tmp_path):
+    runner = CliRunner()
+    for name, workers in (("serial", "1"), ("pool", "2")):
+        result = runner.invoke(
+            main,
+            ["--num-games", "3", "--output-dir", str(tmp_path), "--simulation-name", name, "--seed", "7"]
+            + ["--workers", workers],
+        )
+        assert result.exit_code == 0, result.output
+
+    serial = sorted((tmp_path / "serial").iterdir())
+    pool = sorted((tmp_path / "pool").iterdir())
+    assert [path.name for path in serial] == [path.name for path in pool]
+    for serial_path, pool_path in zip(serial, pool):
+        assert serial_path.read_text(encoding="utf-8") == pool_path.read_text(encoding="utf-8")